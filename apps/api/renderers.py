@@ -0,0 +1,32 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer que codifica con orjson (C/Rust) en lugar de json.dumps.
+    Mismo formato de salida que el renderer de DRF para respuestas compactas;
+    con indent pedido (?format / browsable) delega en el renderer original.
+    Diferencia: NaN e Infinity salen como null en lugar de dar error.
+    """
+    _encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        if (self.ensure_ascii or not self.compact or
+                self.get_indent(accepted_media_type, renderer_context) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Tipos que orjson no conoce (Decimal, lazy strings, etc.) y las
+        # fechas (DRF las formatea distinto) se resuelven con el encoder de DRF
+        ret = orjson.dumps(
+            data,
+            default=self._encoder.default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        )
+        # Igual que DRF: JSON valido como subconjunto de javascript
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
@@ -0,0 +1,19 @@
+import copy
+
+
+class CachedFieldsMixin:
+    """
+    Cachea por clase los campos que arma ModelSerializer.get_fields().
+    Armarlos recorre el modelo en cada instancia; copiar los ya armados
+    (igual que DRF copia los campos declarados) cuesta una fraccion.
+    Solo para serializers cuyos campos no dependen de la instancia ni
+    del contexto.
+    """
+    _fields_cache = {}
+
+    def get_fields(self):
+        cls = type(self)
+        fields = CachedFieldsMixin._fields_cache.get(cls)
+        if fields is None:
+            fields = CachedFieldsMixin._fields_cache.setdefault(cls, super().get_fields())
+        return copy.deepcopy(fields)
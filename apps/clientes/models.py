@@ -1,4 +1,6 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils.translation import gettext_lazy as _
 
 
@@ -61,6 +63,11 @@ class Cliente(models.Model):
         indexes = [
             models.Index(fields=['dni_cuit']),
             models.Index(fields=['apellido', 'nombre']),
+            # Busquedas parciales por DNI (icontains -> UPPER(...) LIKE)
+            GinIndex(
+                OpClass(Upper('dni_cuit'), name='gin_trgm_ops'),
+                name='cliente_dni_trgm',
+            ),
         ]
 
     def __str__(self):
@@ -1,7 +1,10 @@
 import csv
 import os
+import re
 from django.core.management.base import BaseCommand
 from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
 
 from apps.parametros.models import (
     Caja, Combustible, Condicion, Estado, Iva,
@@ -9,112 +12,135 @@ from apps.parametros.models import (
 )
 
 
+# Datos fijos
+CAJAS = ('Automática', 'Manual')
+
+COMBUSTIBLES = ('Diesel', 'Electrico', 'GNC', 'HIBRIDO', 'Nafta')
+
+CONDICIONES = (
+    'Buen estado',
+    'CON DETALLES',
+    'Con detalles de chapa',
+    'CON DETALLES DE GRANIZO',
+    'Excelente estado',
+    'Muy buen estado',
+)
+
+ESTADOS = ('0Km', 'NUEVO', 'Usado')
+
+IVAS = (
+    'Consumidor Final',
+    'Exento',
+    'Inscripto',
+    'No Inscripto',
+    'Resp. Monotributo',
+)
+
+LOCALIDADES = (
+    'A Determinar',
+    'Capital Federal',
+    'Mar del Plata',
+    'Olavarria',
+    'San Fernando',
+    'Tandil',
+    'Ushuaia',
+    'Zarate',
+)
+
+MONEDAS = ('ARS', 'USD', 'EUROS', 'YENS')
+
+SEGMENTOS = (
+    '(HB) 3 PUERTAS',
+    '(HB) 5 puertas',
+    '2 Puertas',
+    '4X2',
+    '4x4',
+    '7 plazas',
+    'Acoplado',
+    'Agro',
+    'Autos Competición',
+    'Berlina',
+    'Bus',
+    'Cabriolet',
+    'Camión',
+    'Camioneta',
+    'Colección',
+    'Coupe',
+    'CUATRICICLO',
+    'Familiar',
+    'Furgon',
+    'Industria',
+    'Minibus',
+    'Monovolumen',
+    'Monovolumen pequeño',
+    'MOTO DE AGUA',
+    'Moto/Cuatriciclo',
+    'Motor Homes',
+    'N/D',
+    'Náutica',
+    'Ómnibus',
+    'Pick up cab. simple',
+    'Pick up doble cabina',
+    'Pick up space cabina',
+    'REMOLQUES',
+    'Rural',
+    'Sedan 4p',
+    'Semirremolque',
+    'SUV',
+    'TAXI',
+    'Todo terreno',
+    'Trailer',
+    'Utilitario',
+    'Van-Mini Van',
+    'Vans',
+)
+
+MARCAS = (
+    'Acoplado', 'Alfa Romeo', 'Aston Martin', 'Audi', 'BAIC', 'Bajaj',
+    'benelli', 'BETAMOTOR', 'BMOVE', 'BMW', 'Bonano', 'Camper', 'CAN-AM',
+    'CASA RODANTE', 'CASILLA', 'Changan', 'Chery', 'Chevrolet', 'Chrysler',
+    'Citroen', 'CORVEN', 'Daelim', 'Daewoo', 'Daihatsu', 'DFSK', 'Dodge',
+    'DS', 'DUCATI', 'DUKE', 'Ferrari', 'Fiat', 'FOODTRUCK', 'Ford', 'Foton',
+    'Geely', 'GMC', 'Great Wall', 'GUERRERO', 'GUZZI', 'HARLEY', 'Haval',
+    'Honda', 'Hummer', 'Husqvarna', 'HYOSUNG', 'Hyundai', 'IKA', 'Isuzu',
+    'Iveco', 'Jaguar', 'JAWA', 'Jeep', 'JOHN DEERE', 'KAWASAKI', 'KELLER',
+    'Kia', 'KTM', 'Kymco', 'Lancia', 'Land Rover', 'LEXUS', 'Lifan', 'Lotus',
+    'MACTRAIL', 'Mahindra', 'Mazda', 'Mercedes-Benz', 'Mini', 'Mitsubishi',
+    'Mondial', 'Morris', 'MOTOMEL', 'Motorhome', 'MUSTANG', 'Nissan', 'Opel',
+    'Peugeot', 'Piaggio', 'Plymouth', 'POLARIS', 'Pontiac', 'Porsche',
+    'Proton', 'Ram', 'Rambler', 'Raptor', 'Rastrojero', 'RAUSER', 'Renault',
+    'Rolls Royce', 'Rover', 'Royal Enfield', 'Scania', 'Scooter', 'SEA DOO',
+    'Seat', 'SEMIRREMOLQUE', 'Shineray', 'SIAM', 'SIAMBRETTA', 'Smart',
+    'ssangyong', 'Subaru', 'Suzuki', 'TIBO', 'Toyota', 'VESPA', 'Volkswagen',
+    'Volvo', 'Yamaha', 'ZANELLA',
+)
+
+# Parametros simples: (modelo, valores, nombre a mostrar)
+_PARAMETROS = (
+    (Caja, CAJAS, 'Cajas'),
+    (Combustible, COMBUSTIBLES, 'Combustibles'),
+    (Condicion, CONDICIONES, 'Condiciones'),
+    (Estado, ESTADOS, 'Estados'),
+    (Iva, IVAS, 'Condiciones IVA'),
+    (Localidad, LOCALIDADES, 'Localidades'),
+    (Moneda, MONEDAS, 'Monedas'),
+    (Segmento, SEGMENTOS, 'Segmentos'),
+)
+
+# Defaults de get_or_create precalculados por orden (1..N) para no crear un
+# dict nuevo en cada fila; get_or_create no modifica el dict recibido.
+_DEFAULTS_ORDEN = tuple(
+    {'orden': orden}
+    for orden in range(max(len(SEGMENTOS), len(MARCAS)) + 1)
+)
+
+# "Marca  Modelo": marca y modelo separados por dos o mas espacios
+_FILA_MODELO_RE = re.compile(r'^\s*(\S.*?)\s{2,}(\S.*?)\s*$')
+
+
 class Command(BaseCommand):
     help = 'Carga los parámetros iniciales en la base de datos'
 
-    # Datos fijos
-    CAJAS = ['Automática', 'Manual']
-
-    COMBUSTIBLES = ['Diesel', 'Electrico', 'GNC', 'HIBRIDO', 'Nafta']
-
-    CONDICIONES = [
-        'Buen estado',
-        'CON DETALLES',
-        'Con detalles de chapa',
-        'CON DETALLES DE GRANIZO',
-        'Excelente estado',
-        'Muy buen estado',
-    ]
-
-    ESTADOS = ['0Km', 'NUEVO', 'Usado']
-
-    IVAS = [
-        'Consumidor Final',
-        'Exento',
-        'Inscripto',
-        'No Inscripto',
-        'Resp. Monotributo',
-    ]
-
-    LOCALIDADES = [
-        'A Determinar',
-        'Capital Federal',
-        'Mar del Plata',
-        'Olavarria',
-        'San Fernando',
-        'Tandil',
-        'Ushuaia',
-        'Zarate',
-    ]
-
-    MONEDAS = ['ARS', 'USD', 'EUROS', 'YENS']
-
-    SEGMENTOS = [
-        '(HB) 3 PUERTAS',
-        '(HB) 5 puertas',
-        '2 Puertas',
-        '4X2',
-        '4x4',
-        '7 plazas',
-        'Acoplado',
-        'Agro',
-        'Autos Competición',
-        'Berlina',
-        'Bus',
-        'Cabriolet',
-        'Camión',
-        'Camioneta',
-        'Colección',
-        'Coupe',
-        'CUATRICICLO',
-        'Familiar',
-        'Furgon',
-        'Industria',
-        'Minibus',
-        'Monovolumen',
-        'Monovolumen pequeño',
-        'MOTO DE AGUA',
-        'Moto/Cuatriciclo',
-        'Motor Homes',
-        'N/D',
-        'Náutica',
-        'Ómnibus',
-        'Pick up cab. simple',
-        'Pick up doble cabina',
-        'Pick up space cabina',
-        'REMOLQUES',
-        'Rural',
-        'Sedan 4p',
-        'Semirremolque',
-        'SUV',
-        'TAXI',
-        'Todo terreno',
-        'Trailer',
-        'Utilitario',
-        'Van-Mini Van',
-        'Vans',
-    ]
-
-    MARCAS = [
-        'Acoplado', 'Alfa Romeo', 'Aston Martin', 'Audi', 'BAIC', 'Bajaj',
-        'benelli', 'BETAMOTOR', 'BMOVE', 'BMW', 'Bonano', 'Camper', 'CAN-AM',
-        'CASA RODANTE', 'CASILLA', 'Changan', 'Chery', 'Chevrolet', 'Chrysler',
-        'Citroen', 'CORVEN', 'Daelim', 'Daewoo', 'Daihatsu', 'DFSK', 'Dodge',
-        'DS', 'DUCATI', 'DUKE', 'Ferrari', 'Fiat', 'FOODTRUCK', 'Ford', 'Foton',
-        'Geely', 'GMC', 'Great Wall', 'GUERRERO', 'GUZZI', 'HARLEY', 'Haval',
-        'Honda', 'Hummer', 'Husqvarna', 'HYOSUNG', 'Hyundai', 'IKA', 'Isuzu',
-        'Iveco', 'Jaguar', 'JAWA', 'Jeep', 'JOHN DEERE', 'KAWASAKI', 'KELLER',
-        'Kia', 'KTM', 'Kymco', 'Lancia', 'Land Rover', 'LEXUS', 'Lifan', 'Lotus',
-        'MACTRAIL', 'Mahindra', 'Mazda', 'Mercedes-Benz', 'Mini', 'Mitsubishi',
-        'Mondial', 'Morris', 'MOTOMEL', 'Motorhome', 'MUSTANG', 'Nissan', 'Opel',
-        'Peugeot', 'Piaggio', 'Plymouth', 'POLARIS', 'Pontiac', 'Porsche',
-        'Proton', 'Ram', 'Rambler', 'Raptor', 'Rastrojero', 'RAUSER', 'Renault',
-        'Rolls Royce', 'Rover', 'Royal Enfield', 'Scania', 'Scooter', 'SEA DOO',
-        'Seat', 'SEMIRREMOLQUE', 'Shineray', 'SIAM', 'SIAMBRETTA', 'Smart',
-        'ssangyong', 'Subaru', 'Suzuki', 'TIBO', 'Toyota', 'VESPA', 'Volkswagen',
-        'Volvo', 'Yamaha', 'ZANELLA',
-    ]
-
     def add_arguments(self, parser):
         parser.add_argument(
             '--csv',
@@ -148,23 +174,12 @@ class Command(BaseCommand):
 
     def _cargar_parametros_simples(self):
         """Carga todos los parámetros simples (sin relaciones)"""
-        parametros = [
-            (Caja, self.CAJAS, 'Cajas'),
-            (Combustible, self.COMBUSTIBLES, 'Combustibles'),
-            (Condicion, self.CONDICIONES, 'Condiciones'),
-            (Estado, self.ESTADOS, 'Estados'),
-            (Iva, self.IVAS, 'Condiciones IVA'),
-            (Localidad, self.LOCALIDADES, 'Localidades'),
-            (Moneda, self.MONEDAS, 'Monedas'),
-            (Segmento, self.SEGMENTOS, 'Segmentos'),
-        ]
-
-        for modelo, valores, nombre in parametros:
+        for modelo, valores, nombre in _PARAMETROS:
             creados = 0
             for orden, valor in enumerate(valores, 1):
                 obj, created = modelo.objects.get_or_create(
                     nombre=valor,
-                    defaults={'orden': orden}
+                    defaults=_DEFAULTS_ORDEN[orden]
                 )
                 if created:
                     creados += 1
@@ -173,10 +188,10 @@ class Command(BaseCommand):
     def _cargar_marcas(self):
         """Carga las marcas de vehículos"""
         creados = 0
-        for orden, nombre in enumerate(self.MARCAS, 1):
+        for orden, nombre in enumerate(MARCAS, 1):
             obj, created = Marca.objects.get_or_create(
                 nombre=nombre,
-                defaults={'orden': orden}
+                defaults=_DEFAULTS_ORDEN[orden]
             )
             if created:
                 creados += 1
@@ -190,8 +205,17 @@ class Command(BaseCommand):
             )
             return
 
-        modelos_creados = 0
         marcas_no_encontradas = set()
+        # Solo id por nombre, leido en streaming para no materializar la tabla
+        marca_cache = {
+            nombre.casefold(): marca_id
+            for marca_id, nombre in Marca.objects.values_list(
+                'id', 'nombre'
+            ).iterator(chunk_size=2000)
+        }
+        # Pares (marca_id, nombre) ya cargados o ya vistos en el CSV
+        vistos = set(Modelo.objects.values_list('marca_id', 'nombre'))
+        nuevos = []
 
         with open(csv_path, 'r', encoding='latin-1') as f:
             reader = csv.reader(f)
@@ -208,35 +232,32 @@ class Command(BaseCommand):
                     continue
 
                 # Separar marca y modelo por doble espacio
-                partes = valor.split('  ', 1)
-                if len(partes) != 2:
+                match = _FILA_MODELO_RE.match(valor)
+                if match is None:
                     continue
 
-                marca_nombre = partes[0].strip()
-                modelo_nombre = partes[1].strip()
-
-                if not marca_nombre or not modelo_nombre:
-                    continue
+                marca_nombre, modelo_nombre = match.groups()
 
                 # Buscar la marca
-                try:
-                    marca = Marca.objects.get(nombre__iexact=marca_nombre)
-                except Marca.DoesNotExist:
-                    # Intentar crear la marca si no existe
+                marca_id = marca_cache.get(marca_nombre.casefold())
+                if marca_id is None:
+                    # Crear la marca si no existe
                     marca, _ = Marca.objects.get_or_create(
                         nombre=marca_nombre,
                         defaults={'orden': 999}
                     )
+                    marca_id = marca.id
+                    marca_cache[marca_nombre.casefold()] = marca_id
                     marcas_no_encontradas.add(marca_nombre)
 
-                # Crear el modelo
-                obj, created = Modelo.objects.get_or_create(
-                    marca=marca,
-                    nombre=modelo_nombre,
-                    defaults={'orden': 0}
-                )
-                if created:
-                    modelos_creados += 1
+                # Saltar modelos repetidos en el CSV o ya existentes
+                clave = (marca_id, modelo_nombre)
+                if clave in vistos:
+                    continue
+                vistos.add(clave)
+                nuevos.append(clave)
+
+        modelos_creados = self._copiar_modelos(nuevos)
 
         self.stdout.write(f'  Modelos: {modelos_creados} creados desde CSV')
 
@@ -246,3 +267,35 @@ class Command(BaseCommand):
                     f'  Marcas creadas automáticamente: {", ".join(sorted(marcas_no_encontradas))}'
                 )
             )
+
+    def _copiar_modelos(self, pares):
+        """
+        Inserta los pares (marca_id, nombre) con COPY a una tabla temporal
+        y un INSERT ... ON CONFLICT DO NOTHING hacia parametros_modelo.
+        Devuelve la cantidad de modelos creados.
+        """
+        if not pares:
+            return 0
+
+        tabla = connection.ops.quote_name(Modelo._meta.db_table)
+        ahora = timezone.now()
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                'CREATE TEMP TABLE tmp_modelos '
+                '(marca_id bigint, nombre varchar(100)) ON COMMIT DROP'
+            )
+            with cursor.copy(
+                'COPY tmp_modelos (marca_id, nombre) FROM STDIN'
+            ) as copy:
+                for par in pares:
+                    copy.write_row(par)
+
+            cursor.execute(
+                f'INSERT INTO {tabla} '
+                '(marca_id, nombre, orden, activo, created_at, updated_at) '
+                'SELECT marca_id, nombre, 0, true, %s, %s FROM tmp_modelos '
+                'ON CONFLICT (marca_id, nombre) DO NOTHING',
+                [ahora, ahora]
+            )
+            return cursor.rowcount
@@ -0,0 +1,98 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:32
+
+from django.db import migrations, models
+from django.db.models import Count
+
+# Marca antes que Modelo: fusionar marcas puede dejar modelos repetidos
+CATALOGOS = (
+    ('Caja', ('nombre',)),
+    ('Combustible', ('nombre',)),
+    ('Condicion', ('nombre',)),
+    ('Estado', ('nombre',)),
+    ('Iva', ('nombre',)),
+    ('Moneda', ('nombre',)),
+    ('Segmento', ('nombre',)),
+    ('Marca', ('nombre',)),
+    ('Modelo', ('marca', 'nombre')),
+)
+
+
+def fusionar_duplicados(apps, schema_editor):
+    """
+    Deja un solo registro por valor de las constraints nuevas: conserva el
+    primero (activos primero, luego por id), apunta a el las FKs de los
+    repetidos y borra los repetidos.
+    """
+    for nombre_modelo, campos in CATALOGOS:
+        modelo = apps.get_model('parametros', nombre_modelo)
+        repetidos = (
+            modelo._base_manager.order_by()
+            .values(*campos)
+            .annotate(cantidad=Count('pk'))
+            .filter(cantidad__gt=1)
+        )
+        for valores in repetidos:
+            valores.pop('cantidad')
+            ids = list(
+                modelo._base_manager.filter(**valores)
+                .order_by('-activo', 'pk')
+                .values_list('pk', flat=True)
+            )
+            conservado, duplicados = ids[0], ids[1:]
+            for relacion in modelo._meta.related_objects:
+                campo = relacion.field.name
+                relacion.related_model._base_manager.filter(
+                    **{f'{campo}__in': duplicados}
+                ).update(**{campo: conservado})
+            modelo._base_manager.filter(pk__in=duplicados).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parametros', '0001_initial'),
+        # Modelos con FKs a los catalogos, para repuntarlas al fusionar
+        ('publicaciones', '0001_initial'),
+        ('reservas', '0001_initial'),
+        ('vehiculos', '0002_vehiculo_tipo_vehiculo'),
+    ]
+
+    operations = [
+        migrations.RunPython(fusionar_duplicados, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='caja',
+            constraint=models.UniqueConstraint(fields=('nombre',), name='parametros_caja_nombre_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='combustible',
+            constraint=models.UniqueConstraint(fields=('nombre',), name='parametros_combustible_nombre_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='condicion',
+            constraint=models.UniqueConstraint(fields=('nombre',), name='parametros_condicion_nombre_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='estado',
+            constraint=models.UniqueConstraint(fields=('nombre',), name='parametros_estado_nombre_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='iva',
+            constraint=models.UniqueConstraint(fields=('nombre',), name='parametros_iva_nombre_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='marca',
+            constraint=models.UniqueConstraint(fields=('nombre',), name='parametros_marca_nombre_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='modelo',
+            constraint=models.UniqueConstraint(fields=('marca', 'nombre'), name='parametros_modelo_marca_nombre_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='moneda',
+            constraint=models.UniqueConstraint(fields=('nombre',), name='parametros_moneda_nombre_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='segmento',
+            constraint=models.UniqueConstraint(fields=('nombre',), name='parametros_segmento_nombre_uniq'),
+        ),
+    ]
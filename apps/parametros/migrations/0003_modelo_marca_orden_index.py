@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parametros', '0002_nombre_unico'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='modelo',
+            index=models.Index(fields=['marca', 'orden', 'nombre'], name='modelo_marca_ord_idx'),
+        ),
+    ]
@@ -1,4 +1,6 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils.translation import gettext_lazy as _
 
 
@@ -31,6 +33,12 @@ class ParametroBase(models.Model):
     class Meta:
         abstract = True
         ordering = ['orden', 'nombre']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['nombre'],
+                name='%(app_label)s_%(class)s_nombre_uniq'
+            ),
+        ]
 
     def __str__(self):
         return self.nombre
@@ -82,6 +90,8 @@ class Localidad(ParametroBase):
     class Meta(ParametroBase.Meta):
         verbose_name = _('Localidad')
         verbose_name_plural = _('Localidades')
+        # Sin nombre unico: hay localidades homonimas en distintas provincias
+        constraints = []
 
 
 class Moneda(ParametroBase):
@@ -106,6 +116,13 @@ class Marca(ParametroBase):
     class Meta(ParametroBase.Meta):
         verbose_name = _('Marca')
         verbose_name_plural = _('Marcas')
+        indexes = [
+            # Trigram sobre UPPER(nombre): sirve a los icontains de ?search=
+            GinIndex(
+                OpClass(Upper('nombre'), name='gin_trgm_ops'),
+                name='marca_nombre_trgm'
+            ),
+        ]
 
 
 class Modelo(ParametroBase):
@@ -120,6 +137,25 @@ class Modelo(ParametroBase):
     class Meta(ParametroBase.Meta):
         verbose_name = _('Modelo')
         verbose_name_plural = _('Modelos')
+        # El nombre de un modelo solo es único dentro de su marca
+        constraints = [
+            models.UniqueConstraint(
+                fields=['marca', 'nombre'],
+                name='parametros_modelo_marca_nombre_uniq'
+            ),
+        ]
+        indexes = [
+            # Cubre marca.modelos.all() con el ordering por defecto
+            models.Index(
+                fields=['marca', 'orden', 'nombre'],
+                name='modelo_marca_ord_idx'
+            ),
+            # Trigram sobre UPPER(nombre): sirve a los icontains de ?search=
+            GinIndex(
+                OpClass(Upper('nombre'), name='gin_trgm_ops'),
+                name='modelo_nombre_trgm'
+            ),
+        ]
 
     def __str__(self):
         return f"{self.marca.nombre} {self.nombre}"
@@ -1,3 +1,4 @@
+from django.db.models import Prefetch
 from rest_framework import viewsets
 from rest_framework.filters import SearchFilter, OrderingFilter
 from rest_framework.permissions import IsAuthenticated, AllowAny
@@ -108,6 +109,19 @@ class MarcaViewSet(ParametroBaseViewSet):
             permission_classes = [IsAuthenticated]
         return [permission() for permission in permission_classes]
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'retrieve':
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    'modelos',
+                    queryset=Modelo.objects.only(
+                        'id', 'marca_id', 'nombre', 'activo', 'orden'
+                    ).order_by('orden', 'nombre')
+                )
+            )
+        return queryset
+
     def get_serializer_class(self):
         if self.action == 'retrieve':
             return MarcaConModelosSerializer
@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.db.models import Count
 from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
@@ -6,6 +7,18 @@ from django.utils import timezone
 from .models import PublicacionVehiculo, ImagenPublicacion, EstadoPublicacion
 
 
+# Badges de estado renderizados una sola vez (SafeString reutilizable)
+_ESTADO_BADGE_HTML = '<span style="color: {}; font-weight: bold;">{}</span>'
+_ESTADO_BADGES = {
+    estado.value: format_html(_ESTADO_BADGE_HTML, color, estado.label)
+    for estado, color in (
+        (EstadoPublicacion.PENDIENTE, '#f59e0b'),  # Naranja
+        (EstadoPublicacion.VISTA, '#3b82f6'),      # Azul
+        (EstadoPublicacion.ELIMINADA, '#ef4444'),  # Rojo
+    )
+}
+
+
 class ImagenPublicacionInline(admin.TabularInline):
     model = ImagenPublicacion
     extra = 0
@@ -39,6 +52,7 @@ class PublicacionVehiculoAdmin(admin.ModelAdmin):
         'modelo__nombre',
     )
     raw_id_fields = ('marca', 'modelo')
+    list_select_related = ('marca', 'modelo')
     readonly_fields = (
         'revisada_por',
         'fecha_revision',
@@ -47,6 +61,12 @@ class PublicacionVehiculoAdmin(admin.ModelAdmin):
     )
     inlines = [ImagenPublicacionInline]
 
+    def get_queryset(self, request):
+        """Anota la cantidad de imagenes para el listado."""
+        return super().get_queryset(request).annotate(
+            _cant_imagenes=Count('imagenes')
+        )
+
     def get_readonly_fields(self, request, obj=None):
         """Campos editables al crear, readonly al editar."""
         if obj:  # Editando
@@ -91,22 +111,20 @@ class PublicacionVehiculoAdmin(admin.ModelAdmin):
     vehiculo_display.short_description = _('Vehiculo')
 
     def estado_badge(self, obj):
-        colors = {
-            'pendiente': '#f59e0b',  # Naranja
-            'vista': '#3b82f6',      # Azul
-            'eliminada': '#ef4444',  # Rojo
-        }
-        color = colors.get(obj.estado, '#6b7280')
-        return format_html(
-            '<span style="color: {}; font-weight: bold;">{}</span>',
-            color,
-            obj.get_estado_display()
-        )
+        badge = _ESTADO_BADGES.get(obj.estado)
+        if badge is None:
+            return format_html(
+                _ESTADO_BADGE_HTML,
+                '#6b7280',
+                obj.get_estado_display()
+            )
+        return badge
     estado_badge.short_description = _('Estado')
 
     def cant_imagenes(self, obj):
-        return obj.imagenes.count()
+        return obj._cant_imagenes
     cant_imagenes.short_description = _('Imagenes')
+    cant_imagenes.admin_order_field = '_cant_imagenes'
 
     def save_model(self, request, obj, form, change):
         """Asigna el usuario que revisa si cambia el estado."""
@@ -139,6 +157,8 @@ class PublicacionVehiculoAdmin(admin.ModelAdmin):
 @admin.register(ImagenPublicacion)
 class ImagenPublicacionAdmin(admin.ModelAdmin):
     list_display = ('publicacion', 'orden', 'created_at')
+    # __str__ de la publicacion usa marca y modelo
+    list_select_related = ('publicacion__marca', 'publicacion__modelo')
     list_filter = ('created_at',)
     search_fields = ('publicacion__nombre', 'publicacion__email')
     readonly_fields = ('created_at',)
@@ -0,0 +1,74 @@
+"""
+Management command para comprimir las imagenes de publicaciones que quedaron
+sin comprimir.
+
+La compresion corre en un pool de threads del proceso web (ver
+publicaciones.tasks): si el proceso se reinicia con tareas en cola, esas
+imagenes quedan con el original y comprimida=False. Este comando las
+comprime.
+
+Uso:
+    python manage.py comprimir_imagenes_publicaciones
+    python manage.py comprimir_imagenes_publicaciones --minutos 30
+    python manage.py comprimir_imagenes_publicaciones --dry-run
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.publicaciones.models import ImagenPublicacion
+
+
+class Command(BaseCommand):
+    help = 'Comprime las imagenes de publicaciones que quedaron sin comprimir'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--minutos',
+            type=int,
+            default=10,
+            help='Solo imagenes creadas hace mas de N minutos, para no pisar '
+                 'las que todavia estan en cola (default: 10)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Solo lista las imagenes pendientes'
+        )
+
+    def handle(self, *args, **options):
+        limite = timezone.now() - timedelta(minutes=options['minutos'])
+        pendientes = list(
+            ImagenPublicacion.objects.filter(
+                comprimida=False,
+                created_at__lt=limite
+            ).values_list('pk', flat=True)
+        )
+        self.stdout.write(f'Imagenes sin comprimir: {len(pendientes)}')
+
+        comprimidas = 0
+        errores = 0
+        for pk in pendientes:
+            imagen = ImagenPublicacion.objects.filter(pk=pk, comprimida=False).first()
+            if imagen is None:
+                # Borrada o comprimida mientras tanto
+                continue
+            if options['dry_run']:
+                self.stdout.write(f'  [PENDIENTE] {imagen.imagen.name}')
+                continue
+            try:
+                imagen.comprimir()
+            except Exception as e:
+                errores += 1
+                self.stdout.write(self.style.ERROR(f'  [ERROR] {imagen.imagen.name}: {e}'))
+                continue
+            if imagen.comprimida:
+                comprimidas += 1
+                self.stdout.write(self.style.SUCCESS(f'  [OK] {imagen.imagen.name}'))
+            else:
+                errores += 1
+                self.stdout.write(self.style.WARNING(f'  [SIN CAMBIOS] {imagen.imagen.name} (no se pudo comprimir)'))
+
+        self.stdout.write(f'Comprimidas: {comprimidas} - Errores: {errores}')
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parametros', '0004_nombre_trigram_index'),
+        ('publicaciones', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='publicacionvehiculo',
+            name='publicacion_estado_f57435_idx',
+        ),
+        migrations.AddIndex(
+            model_name='publicacionvehiculo',
+            index=models.Index(fields=['estado', '-created_at'], name='pub_estado_created_idx'),
+        ),
+    ]
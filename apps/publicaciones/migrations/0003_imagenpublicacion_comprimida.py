@@ -0,0 +1,26 @@
+# Generated by Django 5.2.8 on 2026-10-16 00:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('publicaciones', '0002_estado_created_index'),
+    ]
+
+    operations = [
+        # Las imagenes existentes ya se comprimieron al guardarse (la
+        # compresion era sincronica): se agregan como comprimidas y el
+        # default pasa a False para las nuevas
+        migrations.AddField(
+            model_name='imagenpublicacion',
+            name='comprimida',
+            field=models.BooleanField(default=True, verbose_name='comprimida'),
+        ),
+        migrations.AlterField(
+            model_name='imagenpublicacion',
+            name='comprimida',
+            field=models.BooleanField(default=False, verbose_name='comprimida'),
+        ),
+    ]
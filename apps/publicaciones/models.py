@@ -1,12 +1,27 @@
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.files.uploadedfile import InMemoryUploadedFile
 from PIL import Image
 from io import BytesIO
-import sys
 import os
 
+from .tasks import encolar_compresion_imagen
+
+
+# Limites de imagenes subidas (evita decodificar "pixel bombs"). Se validan
+# en PublicacionSerializer y en la tarea de compresion; no se toca
+# Image.MAX_IMAGE_PIXELS, que es global al proceso
+MAX_IMAGEN_PIXELES = 40_000_000
+MAX_IMAGEN_BYTES = 20 * 1024 * 1024
+
+# Formatos de compresion: (extension, content type, opciones de Image.save)
+FORMATOS_COMPRESION = {
+    'WEBP': ('webp', 'image/webp', {'quality': 78, 'method': 4}),
+    'JPEG': ('jpg', 'image/jpeg', {'quality': 80, 'optimize': True}),
+}
+
 
 class TipoVehiculo(models.TextChoices):
     """Tipos de vehiculos para publicaciones."""
@@ -122,7 +137,11 @@ class PublicacionVehiculo(models.Model):
         verbose_name = _('Publicacion de Vehiculo')
         verbose_name_plural = _('Publicaciones de Vehiculos')
         indexes = [
-            models.Index(fields=['estado']),
+            # Filtro por estado + orden por fecha (cubre tambien estado solo)
+            models.Index(
+                fields=['estado', '-created_at'],
+                name='pub_estado_created_idx'
+            ),
             models.Index(fields=['email']),
             models.Index(fields=['created_at']),
         ]
@@ -152,6 +171,13 @@ class ImagenPublicacion(models.Model):
         default=0,
         help_text=_('Orden de visualizacion')
     )
+    # La compresion corre en un thread del proceso: si el proceso se
+    # reinicia antes, la imagen queda sin comprimir hasta que la retome
+    # el comando comprimir_imagenes_publicaciones
+    comprimida = models.BooleanField(
+        _('comprimida'),
+        default=False
+    )
     created_at = models.DateTimeField(
         _('fecha de creacion'),
         auto_now_add=True
@@ -166,42 +192,67 @@ class ImagenPublicacion(models.Model):
         return f"Imagen {self.orden} - {self.publicacion}"
 
     def save(self, *args, **kwargs):
-        # Comprimir imagen antes de guardar (solo si es nueva o cambio)
-        if self.imagen and hasattr(self.imagen, 'file'):
-            self._compress_image()
+        # Imagen nueva o reemplazada: se comprime en segundo plano tras el commit
+        nueva = bool(self.imagen) and not self.imagen._committed
+        if nueva:
+            self.comprimida = False
         super().save(*args, **kwargs)
+        if nueva:
+            pk = self.pk
+            transaction.on_commit(lambda: encolar_compresion_imagen(pk))
+
+    def comprimir(self):
+        """Comprime la imagen ya guardada y reemplaza el archivo original."""
+        original = self.imagen.name
+        if not self._compress_image():
+            return
+        self.comprimida = True
+        # super().save() evita volver a encolar la compresion
+        super().save(update_fields=['imagen', 'comprimida'])
+        if self.imagen.name != original:
+            self.imagen.storage.delete(original)
 
     def _compress_image(self):
-        """Comprime y redimensiona la imagen a JPEG 80% calidad, max 1920x1080."""
+        """
+        Comprime y redimensiona la imagen, max 1920x1080.
+        Formato segun PUBLICACIONES_IMAGEN_FORMATO (WEBP por defecto, o JPEG).
+        """
+        formato = settings.PUBLICACIONES_IMAGEN_FORMATO
+        extension, content_type, opciones = FORMATOS_COMPRESION[formato]
         try:
             img = Image.open(self.imagen)
+            max_size = (1920, 1080)
 
-            # Convertir a RGB si es necesario (RGBA, P -> RGB para JPEG)
+            # JPEG: decodificar ya reducido (escalado DCT de libjpeg)
+            if img.format == 'JPEG':
+                img.draft('RGB', max_size)
+
+            # Convertir a RGB si es necesario (RGBA, P -> RGB)
             if img.mode in ('RGBA', 'P'):
                 img = img.convert('RGB')
 
             # Redimensionar si es muy grande (mantiene aspect ratio)
-            max_size = (1920, 1080)
             img.thumbnail(max_size, Image.Resampling.LANCZOS)
 
-            # Comprimir a JPEG 80%
+            # Comprimir
             output = BytesIO()
-            img.save(output, format='JPEG', quality=80, optimize=True)
+            img.save(output, format=formato, **opciones)
             output.seek(0)
 
-            # Generar nuevo nombre con extension .jpg
+            # Generar nuevo nombre con la extension del formato
             original_name = os.path.splitext(self.imagen.name)[0]
-            new_name = f"{original_name.split('/')[-1]}.jpg"
+            new_name = f"{original_name.split('/')[-1]}.{extension}"
 
             # Reemplazar archivo
             self.imagen = InMemoryUploadedFile(
                 output,
                 'ImageField',
                 new_name,
-                'image/jpeg',
-                sys.getsizeof(output),
+                content_type,
+                output.getbuffer().nbytes,
                 None
             )
+            return True
         except Exception:
-            # Si falla la compresion, guardar imagen original
-            pass
+            # Si falla la compresion, se conserva la imagen original
+            return False
@@ -1,6 +1,14 @@
+from functools import partial
+
+from django.db import transaction
+from PIL import Image
 from rest_framework import serializers
 
-from .models import PublicacionVehiculo, ImagenPublicacion
+from .models import (
+    PublicacionVehiculo, ImagenPublicacion,
+    MAX_IMAGEN_PIXELES, MAX_IMAGEN_BYTES,
+)
+from .tasks import encolar_compresion_imagen
 from apps.parametros.serializers import MarcaSerializer, ModeloSerializer
 
 
@@ -16,7 +24,15 @@ class ImagenPublicacionSerializer(serializers.ModelSerializer):
     def get_imagen_url(self, obj):
         request = self.context.get('request')
         if obj.imagen and request:
-            return request.build_absolute_uri(obj.imagen.url)
+            url = obj.imagen.url
+            # Con R2 + dominio propio la URL ya es absoluta
+            if url.startswith(('http://', 'https://')):
+                return url
+            # El host se calcula una vez por request (contexto compartido)
+            host = self.context.get('_host')
+            if host is None:
+                host = self.context['_host'] = request.build_absolute_uri('/')[:-1]
+            return f'{host}{url}'
         return None
 
 
@@ -62,21 +78,50 @@ class PublicacionCreateSerializer(serializers.ModelSerializer):
         return data
 
     def validate_imagenes(self, value):
-        """Valida maximo 4 imagenes."""
+        """Valida maximo 4 imagenes, su peso y sus dimensiones."""
         if len(value) > 4:
             raise serializers.ValidationError('Maximo 4 imagenes permitidas.')
+
+        for imagen in value:
+            if imagen.size > MAX_IMAGEN_BYTES:
+                raise serializers.ValidationError(
+                    f'Cada imagen debe pesar como maximo '
+                    f'{MAX_IMAGEN_BYTES // (1024 * 1024)} MB.'
+                )
+
+            # Solo lee el encabezado, no decodifica la imagen
+            imagen.seek(0)
+            with Image.open(imagen) as probe:
+                ancho, alto = probe.size
+            imagen.seek(0)
+
+            if ancho * alto > MAX_IMAGEN_PIXELES:
+                raise serializers.ValidationError(
+                    f'La imagen "{imagen.name}" es demasiado grande '
+                    f'({ancho}x{alto} px).'
+                )
+
         return value
 
     def create(self, validated_data):
         imagenes_data = validated_data.pop('imagenes', [])
-        publicacion = PublicacionVehiculo.objects.create(**validated_data)
 
-        for idx, imagen in enumerate(imagenes_data):
-            ImagenPublicacion.objects.create(
-                publicacion=publicacion,
-                imagen=imagen,
-                orden=idx
-            )
+        with transaction.atomic():
+            publicacion = PublicacionVehiculo.objects.create(**validated_data)
+            imagenes = ImagenPublicacion.objects.bulk_create([
+                ImagenPublicacion(
+                    publicacion=publicacion,
+                    imagen=imagen,
+                    orden=idx
+                )
+                for idx, imagen in enumerate(imagenes_data)
+            ])
+
+            # bulk_create no pasa por save(): encolar la compresion a mano
+            for imagen in imagenes:
+                transaction.on_commit(
+                    partial(encolar_compresion_imagen, imagen.pk)
+                )
 
         return publicacion
 
@@ -89,7 +134,7 @@ class PublicacionListSerializer(serializers.ModelSerializer):
     modelo_nombre = serializers.CharField(source='modelo.nombre', read_only=True)
     tipo_vehiculo_display = serializers.CharField(source='get_tipo_vehiculo_display', read_only=True)
     estado_display = serializers.CharField(source='get_estado_display', read_only=True)
-    cant_imagenes = serializers.SerializerMethodField()
+    cant_imagenes = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = PublicacionVehiculo
@@ -112,9 +157,6 @@ class PublicacionListSerializer(serializers.ModelSerializer):
             'created_at',
         ]
 
-    def get_cant_imagenes(self, obj):
-        return obj.imagenes.count()
-
 
 class PublicacionDetailSerializer(serializers.ModelSerializer):
     """
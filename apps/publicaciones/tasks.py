@@ -0,0 +1,52 @@
+"""
+Tareas en segundo plano de publicaciones.
+
+El proyecto no tiene un broker de colas, por lo que las tareas corren en un
+pool de threads del propio proceso, fuera del ciclo request/response.
+Las tareas en cola no sobreviven a un reinicio del proceso: las imagenes que
+quedan con comprimida=False las retoma el comando
+comprimir_imagenes_publicaciones.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(
+    max_workers=2,
+    thread_name_prefix='publicaciones-imagenes'
+)
+
+
+def comprimir_imagen_publicacion(pk):
+    """Comprime la imagen de publicacion indicada, si todavia existe."""
+    from .models import ImagenPublicacion, MAX_IMAGEN_PIXELES
+
+    try:
+        imagen = ImagenPublicacion.objects.filter(pk=pk).first()
+        if imagen is None:
+            return
+        # Solo lee el encabezado: no decodificar imagenes enormes
+        with Image.open(imagen.imagen) as probe:
+            ancho, alto = probe.size
+        imagen.imagen.seek(0)
+        if ancho * alto > MAX_IMAGEN_PIXELES:
+            logger.warning(
+                'Imagen de publicacion %s demasiado grande para comprimir (%sx%s px)',
+                pk, ancho, alto
+            )
+            return
+        imagen.comprimir()
+    except Exception:
+        logger.exception('Error comprimiendo imagen de publicacion %s', pk)
+    finally:
+        # Cada thread del pool abre su propia conexion
+        connection.close()
+
+
+def encolar_compresion_imagen(pk):
+    """Encola la compresion de una imagen de publicacion."""
+    _executor.submit(comprimir_imagen_publicacion, pk)
@@ -5,9 +5,13 @@ from rest_framework.filters import SearchFilter, OrderingFilter
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from django_filters.rest_framework import DjangoFilterBackend
+from django.db.models import Count, IntegerField, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
-from .models import PublicacionVehiculo, EstadoPublicacion, TipoVehiculo
+from .models import (
+    PublicacionVehiculo, ImagenPublicacion, EstadoPublicacion, TipoVehiculo
+)
 from .serializers import (
     PublicacionCreateSerializer,
     PublicacionListSerializer,
@@ -17,6 +21,13 @@ from .serializers import (
 from .filters import PublicacionFilter
 
 
+# Los tipos de vehiculo son fijos (dependen solo del codigo desplegado)
+_TIPOS_VEHICULO_PAYLOAD = tuple(
+    {'value': value, 'label': label}
+    for value, label in TipoVehiculo.choices
+)
+
+
 class TiposVehiculoView(viewsets.ViewSet):
     """
     Vista para obtener los tipos de vehiculo disponibles.
@@ -25,11 +36,7 @@ class TiposVehiculoView(viewsets.ViewSet):
     permission_classes = [AllowAny]
 
     def list(self, request):
-        tipos = [
-            {'value': choice[0], 'label': choice[1]}
-            for choice in TipoVehiculo.choices
-        ]
-        return Response(tipos)
+        return Response(_TIPOS_VEHICULO_PAYLOAD)
 
 
 class PublicacionViewSet(viewsets.ModelViewSet):
@@ -39,10 +46,6 @@ class PublicacionViewSet(viewsets.ModelViewSet):
     - POST (create): Publico - clientes pueden enviar publicaciones
     - GET/PUT/PATCH/DELETE: Requieren autenticacion (staff)
     """
-    queryset = PublicacionVehiculo.objects.select_related(
-        'marca', 'modelo', 'revisada_por'
-    ).prefetch_related('imagenes').all()
-
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_class = PublicacionFilter
     search_fields = ['nombre', 'email', 'telefono', 'marca__nombre', 'modelo__nombre']
@@ -58,6 +61,48 @@ class PublicacionViewSet(viewsets.ModelViewSet):
             permission_classes = [IsAuthenticated]
         return [permission() for permission in permission_classes]
 
+    def get_queryset(self):
+        """
+        Retorna queryset optimizado segun la accion.
+        En el listado solo se necesita la cantidad de imagenes (anotada);
+        las imagenes se precargan solo en las acciones que las serializan.
+        """
+        if self.action == 'list':
+            # Subconsulta correlacionada en lugar de JOIN + GROUP BY: solo se
+            # evalua para las filas de la pagina y usa el indice de la FK
+            cant_imagenes = ImagenPublicacion.objects.filter(
+                publicacion=OuterRef('pk')
+            ).order_by().values('publicacion').annotate(
+                total=Count('id')
+            ).values('total')
+            # Solo las columnas que usa PublicacionListSerializer
+            return PublicacionVehiculo.objects.select_related(
+                'marca', 'modelo'
+            ).only(
+                'id', 'nombre', 'email', 'telefono', 'tipo_vehiculo',
+                'marca__id', 'marca__nombre', 'modelo__id', 'modelo__nombre',
+                'anio', 'km', 'estado', 'created_at',
+            ).annotate(
+                cant_imagenes=Coalesce(
+                    Subquery(cant_imagenes, output_field=IntegerField()), 0
+                )
+            )
+
+        queryset = PublicacionVehiculo.objects.select_related(
+            'marca', 'modelo', 'revisada_por'
+        )
+        if self.action in ('retrieve', 'marcar_vista', 'marcar_eliminada'):
+            # PublicacionDetailSerializer: modelo_detail lee modelo.marca.nombre
+            return queryset.select_related('modelo__marca').prefetch_related(
+                Prefetch(
+                    'imagenes',
+                    queryset=ImagenPublicacion.objects.only(
+                        'id', 'publicacion_id', 'imagen', 'orden', 'created_at'
+                    )
+                )
+            )
+        return queryset
+
     def get_serializer_class(self):
         if self.action == 'create':
             return PublicacionCreateSerializer
@@ -75,7 +120,9 @@ class PublicacionViewSet(viewsets.ModelViewSet):
         publicacion.estado = EstadoPublicacion.VISTA
         publicacion.revisada_por = request.user
         publicacion.fecha_revision = timezone.now()
-        publicacion.save()
+        publicacion.save(update_fields=[
+            'estado', 'revisada_por', 'fecha_revision', 'updated_at'
+        ])
 
         serializer = PublicacionDetailSerializer(publicacion, context={'request': request})
         return Response(serializer.data)
@@ -88,13 +135,15 @@ class PublicacionViewSet(viewsets.ModelViewSet):
         publicacion.estado = EstadoPublicacion.ELIMINADA
         publicacion.revisada_por = request.user
         publicacion.fecha_revision = timezone.now()
+        update_fields = ['estado', 'revisada_por', 'fecha_revision', 'updated_at']
 
         # Guardar nota si viene en el request
         notas = request.data.get('notas_staff', '')
         if notas:
             publicacion.notas_staff = notas
+            update_fields.append('notas_staff')
 
-        publicacion.save()
+        publicacion.save(update_fields=update_fields)
 
         serializer = PublicacionDetailSerializer(publicacion, context={'request': request})
         return Response(serializer.data)
@@ -2,7 +2,37 @@ from django.contrib import admin
 from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
 
-from .models import Reserva, FormaPago, GastoAdministrativo, NotaReserva
+from .models import (
+    Reserva, FormaPago, GastoAdministrativo, NotaReserva,
+    TipoOperacion, EstadoReserva,
+)
+
+
+# Badges renderizados una sola vez (SafeString reutilizable)
+_TIPO_OPERACION_HTML = (
+    '<span style="background-color: {}; color: white; padding: 3px 8px; '
+    'border-radius: 3px; font-size: 11px;">{}</span>'
+)
+_TIPO_OPERACION_BADGES = {
+    tipo.value: format_html(_TIPO_OPERACION_HTML, color, tipo.label)
+    for tipo, color in (
+        (TipoOperacion.USED, '#3B82F6'),      # Azul
+        (TipoOperacion.NEW, '#EF4444'),       # Rojo
+        (TipoOperacion.EXTERNAL, '#F59E0B'),  # Amarillo
+    )
+}
+
+_ESTADO_HTML = '<span style="color: {}; font-weight: 500;">{}</span>'
+_ESTADO_BADGES = {
+    estado.value: format_html(_ESTADO_HTML, color, estado.label)
+    for estado, color in (
+        (EstadoReserva.PENDING, '#F59E0B'),
+        (EstadoReserva.DELIVERED, '#10B981'),
+        (EstadoReserva.CANCELLED, '#EF4444'),
+        (EstadoReserva.CANCELLED_LOST_DEPOSIT, '#991B1B'),
+        (EstadoReserva.RESTRUCTURING, '#8B5CF6'),
+    )
+}
 
 
 class FormaPagoInline(admin.TabularInline):
@@ -25,6 +55,9 @@ class NotaReservaInline(admin.TabularInline):
     fields = ('contenido', 'autor', 'created_at')
     readonly_fields = ('autor', 'created_at')
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('autor')
+
 
 @admin.register(Reserva)
 class ReservaAdmin(admin.ModelAdmin):
@@ -39,6 +72,10 @@ class ReservaAdmin(admin.ModelAdmin):
         'fecha_entrega_pactada',
         'created_at',
     )
+    # vehiculo_display usa vehiculo.titulo (marca y modelo)
+    list_select_related = (
+        'cliente', 'vehiculo__marca', 'vehiculo__modelo', 'vendedor_1'
+    )
     list_filter = (
         'tipo_operacion',
         'estado',
@@ -117,34 +154,25 @@ class ReservaAdmin(admin.ModelAdmin):
     list_per_page = 25
 
     def tipo_operacion_color(self, obj):
-        colores = {
-            'used': '#3B82F6',      # Azul
-            'new': '#EF4444',       # Rojo
-            'external': '#F59E0B',  # Amarillo
-        }
-        color = colores.get(obj.tipo_operacion, '#9E9E9E')
-        return format_html(
-            '<span style="background-color: {}; color: white; padding: 3px 8px; '
-            'border-radius: 3px; font-size: 11px;">{}</span>',
-            color,
-            obj.get_tipo_operacion_display()
-        )
+        badge = _TIPO_OPERACION_BADGES.get(obj.tipo_operacion)
+        if badge is None:
+            return format_html(
+                _TIPO_OPERACION_HTML,
+                '#9E9E9E',
+                obj.get_tipo_operacion_display()
+            )
+        return badge
     tipo_operacion_color.short_description = _('Tipo')
 
     def estado_display(self, obj):
-        colores = {
-            'pending': '#F59E0B',
-            'delivered': '#10B981',
-            'cancelled': '#EF4444',
-            'cancelled_lost_deposit': '#991B1B',
-            'restructuring': '#8B5CF6',
-        }
-        color = colores.get(obj.estado, '#6B7280')
-        return format_html(
-            '<span style="color: {}; font-weight: 500;">{}</span>',
-            color,
-            obj.get_estado_display()
-        )
+        badge = _ESTADO_BADGES.get(obj.estado)
+        if badge is None:
+            return format_html(
+                _ESTADO_HTML,
+                '#6B7280',
+                obj.get_estado_display()
+            )
+        return badge
     estado_display.short_description = _('Estado')
 
     def vehiculo_display(self, obj):
@@ -163,25 +191,37 @@ class ReservaAdmin(admin.ModelAdmin):
         super().save_model(request, obj, form, change)
 
 
+class ReservaRelacionadaAdminMixin:
+    """El select de reserva solo trae lo que muestra Reserva.__str__."""
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name == 'reserva':
+            kwargs['queryset'] = Reserva.objects.for_str()
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+
 @admin.register(FormaPago)
-class FormaPagoAdmin(admin.ModelAdmin):
+class FormaPagoAdmin(ReservaRelacionadaAdminMixin, admin.ModelAdmin):
     list_display = ('reserva', 'tipo', 'monto', 'created_at')
+    list_select_related = ('reserva__cliente',)
     list_filter = ('tipo', 'created_at')
     search_fields = ('reserva__numero_reserva',)
     ordering = ('-created_at',)
 
 
 @admin.register(GastoAdministrativo)
-class GastoAdministrativoAdmin(admin.ModelAdmin):
+class GastoAdministrativoAdmin(ReservaRelacionadaAdminMixin, admin.ModelAdmin):
     list_display = ('reserva', 'concepto', 'monto', 'tipo_cuenta', 'fecha')
+    list_select_related = ('reserva__cliente',)
     list_filter = ('tipo_cuenta', 'created_at')
     search_fields = ('reserva__numero_reserva', 'concepto')
     ordering = ('-created_at',)
 
 
 @admin.register(NotaReserva)
-class NotaReservaAdmin(admin.ModelAdmin):
+class NotaReservaAdmin(ReservaRelacionadaAdminMixin, admin.ModelAdmin):
     list_display = ('reserva', 'autor', 'contenido_truncado', 'created_at')
+    list_select_related = ('reserva__cliente', 'autor')
     list_filter = ('autor', 'created_at')
     search_fields = ('reserva__numero_reserva', 'contenido')
     ordering = ('-created_at',)
@@ -5,3 +5,6 @@ class ReservasConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.reservas'
     verbose_name = 'Reservas'
+
+    def ready(self):
+        from . import signals  # noqa: F401
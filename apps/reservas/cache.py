@@ -0,0 +1,33 @@
+"""
+Cache de las estadisticas de reservas.
+
+Las claves incluyen una version global que se renueva cada vez que se
+escribe una reserva, por lo que no hace falta enumerar claves al invalidar.
+"""
+import hashlib
+import time
+
+from django.core.cache import caches
+
+# Cache propia (CACHES['estadisticas']), compartida entre workers
+cache_estadisticas = caches['estadisticas']
+
+ESTADISTICAS_VERSION_KEY = 'reservas:estadisticas:version'
+
+
+def _version_estadisticas():
+    return cache_estadisticas.get_or_set(ESTADISTICAS_VERSION_KEY, 0, None)
+
+
+def clave_estadisticas(query_params, hoy):
+    """Clave por combinacion de filtros y dia (entregas_hoy cambia a diario)."""
+    filtros = '&'.join(
+        f'{k}={v}' for k, v in sorted(query_params.lists())
+    )
+    digest = hashlib.blake2b(filtros.encode(), digest_size=8).hexdigest()
+    return f'reservas:estadisticas:{_version_estadisticas()}:{hoy.isoformat()}:{digest}'
+
+
+def invalidar_estadisticas():
+    """Renueva la version: las entradas anteriores dejan de usarse."""
+    cache_estadisticas.set(ESTADISTICAS_VERSION_KEY, time.time_ns(), None)
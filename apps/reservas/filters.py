@@ -1,8 +1,26 @@
+from datetime import date, datetime, time, timedelta
+
 import django_filters
-from django.db import models
+from django.utils import timezone
 
 from .models import Reserva, TipoOperacion, EstadoReserva
 
+# Estados que no cuentan como activos; el resto se filtra con un IN positivo
+_ESTADOS_INACTIVOS = {
+    EstadoReserva.CANCELLED,
+    EstadoReserva.CANCELLED_LOST_DEPOSIT,
+    EstadoReserva.RESTRUCTURING,
+}
+_ESTADOS_ACTIVOS = [
+    estado for estado in EstadoReserva.values
+    if estado not in _ESTADOS_INACTIVOS
+]
+
+
+def _inicio_del_dia(dia):
+    """Medianoche del dia en la zona horaria actual."""
+    return timezone.make_aware(datetime.combine(dia, time.min))
+
 
 class ReservaFilter(django_filters.FilterSet):
     """Filtros avanzados para reservas."""
@@ -29,24 +47,12 @@ class ReservaFilter(django_filters.FilterSet):
     )
 
     # Por fechas de creacion
-    fecha_desde = django_filters.DateFilter(
-        field_name='created_at',
-        lookup_expr='date__gte'
-    )
-    fecha_hasta = django_filters.DateFilter(
-        field_name='created_at',
-        lookup_expr='date__lte'
-    )
+    fecha_desde = django_filters.DateFilter(method='filter_fecha_desde')
+    fecha_hasta = django_filters.DateFilter(method='filter_fecha_hasta')
 
     # Por fechas de entrega (filtro principal para reportes)
-    mes_entrega = django_filters.NumberFilter(
-        field_name='fecha_entrega_pactada',
-        lookup_expr='month'
-    )
-    anio_entrega = django_filters.NumberFilter(
-        field_name='fecha_entrega_pactada',
-        lookup_expr='year'
-    )
+    mes_entrega = django_filters.NumberFilter(method='filter_mes_entrega')
+    anio_entrega = django_filters.NumberFilter(method='filter_anio_entrega')
     fecha_entrega_desde = django_filters.DateFilter(
         field_name='fecha_entrega_pactada',
         lookup_expr='gte'
@@ -56,13 +62,13 @@ class ReservaFilter(django_filters.FilterSet):
         lookup_expr='lte'
     )
 
-    # Por monto
+    # Por monto (total de la operacion)
     monto_min = django_filters.NumberFilter(
-        field_name='precio_venta',
+        field_name='total_operacion_db',
         lookup_expr='gte'
     )
     monto_max = django_filters.NumberFilter(
-        field_name='precio_venta',
+        field_name='total_operacion_db',
         lookup_expr='lte'
     )
 
@@ -81,8 +87,56 @@ class ReservaFilter(django_filters.FilterSet):
 
     def filter_vendedor(self, queryset, name, value):
         """Filtra por vendedor_1 o vendedor_2."""
+        # UNION de dos busquedas por indice en lugar de un OR entre columnas;
+        # se usa como subconsulta para que el queryset siga siendo filtrable
+        ids = Reserva.objects.filter(vendedor_1_id=value).order_by().values('pk').union(
+            Reserva.objects.filter(vendedor_2_id=value).order_by().values('pk')
+        )
+        return queryset.filter(pk__in=ids)
+
+    def filter_fecha_desde(self, queryset, name, value):
+        """Creadas desde el inicio del dia (rango sobre el indice de created_at)."""
+        return queryset.filter(created_at__gte=_inicio_del_dia(value))
+
+    def filter_fecha_hasta(self, queryset, name, value):
+        """Creadas hasta el final del dia, inclusive."""
+        return queryset.filter(
+            created_at__lt=_inicio_del_dia(value + timedelta(days=1))
+        )
+
+    def filter_mes_entrega(self, queryset, name, value):
+        """
+        Filtra por mes de entrega. Con anio_entrega se traduce a un rango
+        de fechas para poder usar el indice de fecha_entrega_pactada.
+        """
+        anio = self.form.cleaned_data.get('anio_entrega')
+        if anio is None:
+            return queryset.filter(fecha_entrega_pactada__month=value)
+        mes, anio = int(value), int(anio)
+        try:
+            inicio = date(anio, mes, 1)
+            fin = date(anio + 1, 1, 1) if mes == 12 else date(anio, mes + 1, 1)
+        except ValueError:
+            # Mes o anio fuera de rango: ninguna fecha coincide
+            return queryset.none()
+        return queryset.filter(
+            fecha_entrega_pactada__gte=inicio,
+            fecha_entrega_pactada__lt=fin
+        )
+
+    def filter_anio_entrega(self, queryset, name, value):
+        """Filtra por anio de entrega como rango de fechas."""
+        if self.form.cleaned_data.get('mes_entrega') is not None:
+            # Ya resuelto por filter_mes_entrega
+            return queryset
+        anio = int(value)
+        try:
+            inicio, fin = date(anio, 1, 1), date(anio + 1, 1, 1)
+        except ValueError:
+            return queryset.none()
         return queryset.filter(
-            models.Q(vendedor_1_id=value) | models.Q(vendedor_2_id=value)
+            fecha_entrega_pactada__gte=inicio,
+            fecha_entrega_pactada__lt=fin
         )
 
     def filter_pendientes(self, queryset, name, value):
@@ -94,11 +148,6 @@ class ReservaFilter(django_filters.FilterSet):
     def filter_activas(self, queryset, name, value):
         """Filtra reservas activas (no canceladas ni reestructurando)."""
         if value:
-            return queryset.exclude(
-                estado__in=[
-                    EstadoReserva.CANCELLED,
-                    EstadoReserva.CANCELLED_LOST_DEPOSIT,
-                    EstadoReserva.RESTRUCTURING,
-                ]
-            )
+            # IN positivo: a diferencia de NOT IN, puede usar el indice de estado
+            return queryset.filter(estado__in=_ESTADOS_ACTIVOS)
         return queryset
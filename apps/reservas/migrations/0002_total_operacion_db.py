@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:42
+
+import django.db.models.expressions
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clientes', '0001_initial'),
+        ('parametros', '0004_nombre_trigram_index'),
+        ('reservas', '0001_initial'),
+        ('vehiculos', '0002_vehiculo_tipo_vehiculo'),
+        ('vendedores', '0002_email_opcional'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reserva',
+            name='total_operacion_db',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('precio_venta'), '+', models.F('comision_vendedor')), '+', models.F('comision_comprador')), '+', models.F('gestion_credito')), '+', models.F('gastos_transferencia')), '+', models.F('costo_patentamiento')), '+', models.F('costo_flete')), '+', models.F('impuestos')), '+', models.F('otros_gastos')), output_field=models.DecimalField(decimal_places=2, max_digits=14), verbose_name='total operacion'),
+        ),
+        migrations.AddIndex(
+            model_name='reserva',
+            index=models.Index(fields=['total_operacion_db'], name='reservas_re_total_o_94bd5b_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:43
+
+from django.db import migrations, models
+
+
+def cargar_contadores(apps, schema_editor):
+    """Inicializa los contadores con el ultimo numero emitido por anio."""
+    Reserva = apps.get_model('reservas', 'Reserva')
+    ContadorReserva = apps.get_model('reservas', 'ContadorReserva')
+
+    ultimos = {}
+    for numero in Reserva.objects.values_list('numero_reserva', flat=True).iterator():
+        partes = numero.split('-')
+        if len(partes) != 3 or not partes[1].isdigit() or not partes[2].isdigit():
+            continue
+        anio, num = int(partes[1]), int(partes[2])
+        if num > ultimos.get(anio, 0):
+            ultimos[anio] = num
+
+    ContadorReserva.objects.bulk_create([
+        ContadorReserva(anio=anio, ultimo_numero=num)
+        for anio, num in ultimos.items()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservas', '0002_total_operacion_db'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContadorReserva',
+            fields=[
+                ('anio', models.PositiveIntegerField(primary_key=True, serialize=False, verbose_name='anio')),
+                ('ultimo_numero', models.PositiveIntegerField(default=0, verbose_name='ultimo numero')),
+            ],
+            options={
+                'verbose_name': 'Contador de Reservas',
+                'verbose_name_plural': 'Contadores de Reservas',
+            },
+        ),
+        migrations.RunPython(cargar_contadores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clientes', '0002_dni_trigram_index'),
+        ('parametros', '0004_nombre_trigram_index'),
+        ('reservas', '0004_tipo_estado_fecha_index'),
+        ('vehiculos', '0002_vehiculo_tipo_vehiculo'),
+        ('vendedores', '0002_email_opcional'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='reserva',
+            name='reservas_re_vehicul_abbf95_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='reserva',
+            name='reservas_re_cliente_e986e9_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='reserva',
+            name='reservas_re_vendedo_d40733_idx',
+        ),
+        migrations.AddIndex(
+            model_name='reserva',
+            index=models.Index(condition=models.Q(('estado', 'pending')), fields=['fecha_entrega_pactada'], name='reserva_pendientes_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clientes', '0002_dni_trigram_index'),
+        ('parametros', '0004_nombre_trigram_index'),
+        ('reservas', '0005_fk_indexes_pendientes'),
+        ('vehiculos', '0002_vehiculo_tipo_vehiculo'),
+        ('vendedores', '0002_email_opcional'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='reserva',
+            name='reservas_re_estado_7c17e1_idx',
+        ),
+        migrations.AddIndex(
+            model_name='reserva',
+            index=models.Index(fields=['estado', 'fecha_entrega_pactada'], name='reserva_estado_fecha_idx'),
+        ),
+    ]
@@ -1,9 +1,14 @@
-from django.db import models
+from django.db import connection, models, transaction
+from django.db.models import F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Concat, Trim
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django.core.validators import MinValueValidator
 from decimal import Decimal
 
+from .cache import invalidar_estadisticas
+
 
 class TipoOperacion(models.TextChoices):
     """Tipos de operacion con colores asociados."""
@@ -21,6 +26,122 @@ class EstadoReserva(models.TextChoices):
     RESTRUCTURING = 'restructuring', _('A reestructurar')
 
 
+# get_FOO_display() reconstruye el dict de choices en cada llamada; las
+# etiquetas quedan lazy para respetar el idioma activo
+_TIPO_OPERACION_DISPLAY = dict(TipoOperacion.choices)
+_ESTADO_RESERVA_DISPLAY = dict(EstadoReserva.choices)
+
+# Color por tipo de operacion (claves como str para evitar la coercion al enum)
+_COLOR_OPERACION = {
+    TipoOperacion.USED.value: 'blue',
+    TipoOperacion.NEW.value: 'red',
+    TipoOperacion.EXTERNAL.value: 'yellow',
+}
+
+
+def nombre_completo_usuario(relacion):
+    """Expresion con el mismo resultado que Usuario.get_full_name()."""
+    return Trim(Concat(
+        f'{relacion}__first_name', Value(' '), f'{relacion}__last_name',
+        output_field=models.CharField()
+    ))
+
+
+class ReservaQuerySet(models.QuerySet):
+    """QuerySet de reservas con anotaciones de totales."""
+
+    def with_totales(self):
+        """
+        Anota _total_pagado con una subconsulta por reserva, para que
+        total_pagado no consulte las formas de pago fila por fila.
+        """
+        pagado = FormaPago.objects.filter(
+            reserva=OuterRef('pk')
+        ).order_by().values('reserva').annotate(
+            total=Sum('monto')
+        ).values('total')
+        return self.annotate(
+            _total_pagado=Coalesce(
+                Subquery(pagado),
+                Decimal('0'),
+                output_field=models.DecimalField(max_digits=14, decimal_places=2)
+            )
+        )
+
+    def bulk_create_with_numbers(self, objs, **kwargs):
+        """
+        bulk_create que asigna numero_reserva a las reservas que no lo tienen,
+        reservando un bloque del contador anual en una sola consulta.
+        """
+        objs = list(objs)
+        sin_numero = [obj for obj in objs if not obj.numero_reserva]
+        if sin_numero:
+            year = timezone.now().year
+            ultimo = ContadorReserva.reservar(year, len(sin_numero))
+            primero = ultimo - len(sin_numero) + 1
+            for num, obj in enumerate(sin_numero, start=primero):
+                obj.numero_reserva = f'RES-{year}-{num:05d}'
+        creadas = self.bulk_create(objs, **kwargs)
+        # bulk_create no envia post_save (ver signals.py)
+        transaction.on_commit(invalidar_estadisticas)
+        return creadas
+
+    def update(self, **kwargs):
+        filas = super().update(**kwargs)
+        # update() no envia post_save (ver signals.py)
+        transaction.on_commit(invalidar_estadisticas)
+        return filas
+
+    def for_str(self):
+        """Solo las columnas que usa Reserva.__str__ (selects, autocompletes)."""
+        return self.select_related('cliente').only(
+            'id', 'numero_reserva', 'cliente__nombre', 'cliente__apellido'
+        )
+
+    def with_nombres(self):
+        """
+        Anota cliente_nombre y vendedor_1_nombre armados en la base (mismo
+        formato que get_full_name), para no construirlos fila por fila.
+        """
+        return self.annotate(
+            cliente_nombre=Concat(
+                'cliente__nombre', Value(' '), 'cliente__apellido',
+                output_field=models.CharField()
+            ),
+            vendedor_1_nombre=nombre_completo_usuario('vendedor_1'),
+        )
+
+    def for_list(self):
+        """
+        Joins, nombres y totales que necesitan los listados
+        (ReservaListSerializer y __str__), para no pagar consultas por fila.
+        Solo se traen las columnas que se leen: el resto (textos de costos,
+        0KM, auditoria) y las filas completas de los joins quedan afuera.
+        """
+        queryset = self
+        if '_total_pagado' not in queryset.query.annotations:
+            queryset = queryset.with_totales()
+        if 'vendedor_1_nombre' not in queryset.query.annotations:
+            queryset = queryset.with_nombres()
+        return queryset.select_related(
+            'cliente',
+            'vehiculo__marca',
+            'vehiculo__modelo',
+            'moneda',
+        ).only(
+            'id', 'numero_reserva', 'tipo_operacion', 'estado',
+            'dominio', 'precio_venta', 'total_operacion_db',
+            'fecha_entrega_pactada', 'entregado', 'transferido', 'created_at',
+            'vendedor_1',
+            # __str__ y cliente_dni
+            'cliente__nombre', 'cliente__apellido', 'cliente__dni_cuit',
+            # Vehiculo.titulo y patente
+            'vehiculo__marca__nombre', 'vehiculo__modelo__nombre',
+            'vehiculo__version', 'vehiculo__anio', 'vehiculo__patente',
+            'moneda__nombre',
+        )
+
+
 class Reserva(models.Model):
     """
     Modelo principal para gestionar reservas/operaciones de venta.
@@ -194,6 +315,22 @@ class Reserva(models.Model):
         blank=True,
         help_text=_('Ej: "Se cierra precio en dolares billete"')
     )
+    total_operacion_db = models.GeneratedField(
+        expression=(
+            F('precio_venta') +
+            F('comision_vendedor') +
+            F('comision_comprador') +
+            F('gestion_credito') +
+            F('gastos_transferencia') +
+            F('costo_patentamiento') +
+            F('costo_flete') +
+            F('impuestos') +
+            F('otros_gastos')
+        ),
+        output_field=models.DecimalField(max_digits=14, decimal_places=2),
+        db_persist=True,
+        verbose_name=_('total operacion'),
+    )
 
     # ==========================================================================
     # DATOS ADMINISTRATIVOS
@@ -263,19 +400,32 @@ class Reserva(models.Model):
         auto_now=True
     )
 
+    objects = ReservaQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
         verbose_name = _('Reserva')
         verbose_name_plural = _('Reservas')
         indexes = [
             models.Index(fields=['numero_reserva']),
-            models.Index(fields=['tipo_operacion']),
-            models.Index(fields=['estado']),
-            models.Index(fields=['vehiculo']),
-            models.Index(fields=['cliente']),
-            models.Index(fields=['vendedor_1']),
+            models.Index(
+                fields=['tipo_operacion', 'estado', '-fecha_entrega_pactada'],
+                name='reserva_tipo_estado_fecha_idx',
+            ),
+            # estadisticas y filter_activas filtran por estado (prefijo)
+            models.Index(
+                fields=['estado', 'fecha_entrega_pactada'],
+                name='reserva_estado_fecha_idx',
+            ),
+            # vehiculo, cliente y vendedor_1 ya tienen el indice de la FK
             models.Index(fields=['fecha_entrega_pactada']),
+            models.Index(
+                fields=['fecha_entrega_pactada'],
+                condition=models.Q(estado=EstadoReserva.PENDING),
+                name='reserva_pendientes_idx',
+            ),
             models.Index(fields=['-created_at']),
+            models.Index(fields=['total_operacion_db']),
         ]
 
     def __str__(self):
@@ -285,25 +435,25 @@ class Reserva(models.Model):
         if not self.numero_reserva:
             self.numero_reserva = self._generar_numero_reserva()
         super().save(*args, **kwargs)
+        # La base recalcula total_operacion_db pero save() no lo relee:
+        # se descarta junto con el total cacheado para no responder con
+        # el valor previo (total_operacion vuelve a sumar en Python)
+        self.__dict__.pop('total_operacion_db', None)
+        self.__dict__.pop('total_operacion', None)
 
     def _generar_numero_reserva(self):
         """Genera numero unico: RES-2024-00001"""
         year = timezone.now().year
-        last = Reserva.objects.filter(
-            numero_reserva__startswith=f'RES-{year}-'
-        ).order_by('-numero_reserva').first()
-
-        if last:
-            last_num = int(last.numero_reserva.split('-')[-1])
-            new_num = last_num + 1
-        else:
-            new_num = 1
-
+        new_num = ContadorReserva.reservar(year)
         return f'RES-{year}-{new_num:05d}'
 
-    @property
+    @cached_property
     def total_operacion(self):
         """Calcula el total de la operacion."""
+        # Calculado por la base; si no esta cargado (instancia nueva o
+        # recien guardada) se suma en Python para no consultar de nuevo
+        if 'total_operacion_db' in self.__dict__:
+            return self.total_operacion_db
         return (
             self.precio_venta +
             self.comision_vendedor +
@@ -316,10 +466,17 @@ class Reserva(models.Model):
             self.otros_gastos
         )
 
-    @property
+    @cached_property
     def total_pagado(self):
         """Calcula el total pagado sumando todas las formas de pago."""
-        return sum(fp.monto for fp in self.formas_pago.all())
+        # Anotado por ReservaQuerySet.with_totales()
+        if hasattr(self, '_total_pagado'):
+            return self._total_pagado
+        # Con prefetch se suma en memoria; si no, se agrega en la base
+        # en lugar de traer filas completas de FormaPago
+        if 'formas_pago' in getattr(self, '_prefetched_objects_cache', {}):
+            return sum(fp.monto for fp in self.formas_pago.all())
+        return self.formas_pago.aggregate(total=Sum('monto'))['total'] or Decimal('0')
 
     @property
     def saldo_pendiente(self):
@@ -333,15 +490,25 @@ class Reserva(models.Model):
             return Decimal('0')
         return (self.total_pagado / self.total_operacion) * 100
 
+    @property
+    def patente(self):
+        """Patente del vehiculo vinculado o, si no hay, el dominio cargado."""
+        if self.vehiculo_id:
+            return self.vehiculo.patente
+        return self.dominio
+
+    @property
+    def tipo_operacion_display(self):
+        return _TIPO_OPERACION_DISPLAY.get(self.tipo_operacion, self.tipo_operacion)
+
+    @property
+    def estado_display(self):
+        return _ESTADO_RESERVA_DISPLAY.get(self.estado, self.estado)
+
     @property
     def color_operacion(self):
         """Retorna el color asociado al tipo de operacion."""
-        colores = {
-            TipoOperacion.USED: 'blue',
-            TipoOperacion.NEW: 'red',
-            TipoOperacion.EXTERNAL: 'yellow',
-        }
-        return colores.get(self.tipo_operacion, 'gray')
+        return _COLOR_OPERACION.get(self.tipo_operacion, 'gray')
 
 
 class TipoFormaPago(models.TextChoices):
@@ -354,6 +521,10 @@ class TipoFormaPago(models.TextChoices):
     TRADE_IN = 'trade_in', _('Permuta/Auto entrega')
 
 
+# Ver _TIPO_OPERACION_DISPLAY
+_TIPO_FORMA_PAGO_DISPLAY = dict(TipoFormaPago.choices)
+
+
 class FormaPago(models.Model):
     """
     Formas de pago asociadas a una reserva.
@@ -503,7 +674,11 @@ class FormaPago(models.Model):
         verbose_name_plural = _('Formas de Pago')
 
     def __str__(self):
-        return f"{self.get_tipo_display()} - ${self.monto:,.2f}"
+        return f"{self.tipo_display} - ${self.monto:,.2f}"
+
+    @property
+    def tipo_display(self):
+        return _TIPO_FORMA_PAGO_DISPLAY.get(self.tipo, self.tipo)
 
 
 class TipoCuentaGasto(models.TextChoices):
@@ -512,6 +687,9 @@ class TipoCuentaGasto(models.TextChoices):
     ADMINISTRACION = 'administracion', _('A cuenta administracion')
 
 
+_TIPO_CUENTA_GASTO_DISPLAY = dict(TipoCuentaGasto.choices)
+
+
 class GastoAdministrativo(models.Model):
     """
     Gastos administrativos para operaciones EXTERNAL (gestoria pura).
@@ -562,7 +740,18 @@ class GastoAdministrativo(models.Model):
         verbose_name_plural = _('Gastos Administrativos')
 
     def __str__(self):
-        return f"{self.concepto} - ${self.monto:,.2f} ({self.get_tipo_cuenta_display()})"
+        return f"{self.concepto} - ${self.monto:,.2f} ({self.tipo_cuenta_display})"
+
+    @property
+    def tipo_cuenta_display(self):
+        return _TIPO_CUENTA_GASTO_DISPLAY.get(self.tipo_cuenta, self.tipo_cuenta)
+
+
+class NotaReservaQuerySet(models.QuerySet):
+
+    def with_autor_nombre(self):
+        """Anota _autor_nombre para no leer el autor fila por fila."""
+        return self.annotate(_autor_nombre=nombre_completo_usuario('autor'))
 
 
 class NotaReserva(models.Model):
@@ -589,10 +778,59 @@ class NotaReserva(models.Model):
         auto_now_add=True
     )
 
+    objects = NotaReservaQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
         verbose_name = _('Nota de Reserva')
         verbose_name_plural = _('Notas de Reserva')
 
     def __str__(self):
-        return f"Nota de {self.autor.get_full_name()} - {self.created_at.strftime('%d/%m/%Y %H:%M')}"
+        return f"Nota de {self.autor_nombre} - {self.created_at.strftime('%d/%m/%Y %H:%M')}"
+
+    @property
+    def autor_nombre(self):
+        # Anotado por NotaReservaQuerySet.with_autor_nombre()
+        if hasattr(self, '_autor_nombre'):
+            return self._autor_nombre
+        return self.autor.get_full_name()
+
+
+class ContadorReserva(models.Model):
+    """
+    Ultimo numero de reserva emitido por anio.
+    Reemplaza la busqueda del ultimo numero_reserva en cada alta.
+    """
+    anio = models.PositiveIntegerField(
+        _('anio'),
+        primary_key=True
+    )
+    ultimo_numero = models.PositiveIntegerField(
+        _('ultimo numero'),
+        default=0
+    )
+
+    class Meta:
+        verbose_name = _('Contador de Reservas')
+        verbose_name_plural = _('Contadores de Reservas')
+
+    def __str__(self):
+        return f"{self.anio}: {self.ultimo_numero}"
+
+    @classmethod
+    def reservar(cls, anio, cantidad=1):
+        """
+        Reserva `cantidad` numeros consecutivos del anio y retorna el ultimo.
+        El UPSERT bloquea la fila del anio, por lo que altas concurrentes
+        nunca obtienen el mismo numero.
+        """
+        tabla = connection.ops.quote_name(cls._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {tabla} (anio, ultimo_numero) VALUES (%s, %s) '
+                f'ON CONFLICT (anio) DO UPDATE '
+                f'SET ultimo_numero = {tabla}.ultimo_numero + EXCLUDED.ultimo_numero '
+                f'RETURNING ultimo_numero',
+                [anio, cantidad]
+            )
+            return cursor.fetchone()[0]
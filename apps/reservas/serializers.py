@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from django.db.models import Prefetch
 from django.utils.translation import gettext_lazy as _
 
 from .models import (
@@ -6,26 +7,48 @@ from .models import (
     TipoOperacion, TipoFormaPago
 )
 from apps.clientes.serializers import ClienteMinimalSerializer
+from apps.vehiculos.models import ImagenVehiculo
+
+
+# Campos requeridos por tipo de pago: alcanza con que uno de cada grupo
+# tenga valor; el error se asigna al primero del grupo
+_REQUERIDOS_POR_TIPO_PAGO = {
+    TipoFormaPago.CHECK.value: [
+        (('cheque_banco',), 'El banco es requerido para pagos con cheque.'),
+    ],
+    TipoFormaPago.CREDIT.value: [
+        (('credito_banco',), 'El banco es requerido para creditos.'),
+    ],
+    TipoFormaPago.TRADE_IN.value: [
+        (('permuta_patente', 'permuta_vehiculo'),
+         'Debe indicar la patente o vincular un vehiculo existente.'),
+    ],
+}
 
 
 class NotaReservaSerializer(serializers.ModelSerializer):
     """Serializer para notas de seguimiento."""
-    autor_nombre = serializers.SerializerMethodField()
+    autor_nombre = serializers.CharField(read_only=True)
 
     class Meta:
         model = NotaReserva
         fields = ['id', 'contenido', 'autor', 'autor_nombre', 'created_at']
         read_only_fields = ['id', 'autor', 'created_at']
 
-    def get_autor_nombre(self, obj):
-        return obj.autor.get_full_name()
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Al serializarse anidado el nombre del autor viene anotado."""
+        return queryset.with_autor_nombre()
 
 
 class FormaPagoSerializer(serializers.ModelSerializer):
     """Serializer completo para formas de pago."""
-    tipo_display = serializers.CharField(source='get_tipo_display', read_only=True)
+    tipo_display = serializers.CharField(read_only=True)
     sena_recibida_por_nombre = serializers.SerializerMethodField()
 
+    # FKs que lee al serializarse anidado (ver ReservaSerializer.setup_eager_loading)
+    SELECT_RELATED = ('sena_recibida_por',)
+
     class Meta:
         model = FormaPago
         fields = [
@@ -51,32 +74,16 @@ class FormaPagoSerializer(serializers.ModelSerializer):
 
     def validate(self, data):
         """Validar campos requeridos segun tipo de pago."""
-        tipo = data.get('tipo')
-
-        if tipo == TipoFormaPago.CHECK:
-            if not data.get('cheque_banco'):
-                raise serializers.ValidationError({
-                    'cheque_banco': 'El banco es requerido para pagos con cheque.'
-                })
-
-        if tipo == TipoFormaPago.CREDIT:
-            if not data.get('credito_banco'):
-                raise serializers.ValidationError({
-                    'credito_banco': 'El banco es requerido para creditos.'
-                })
-
-        if tipo == TipoFormaPago.TRADE_IN:
-            if not (data.get('permuta_patente') or data.get('permuta_vehiculo')):
-                raise serializers.ValidationError({
-                    'permuta_patente': 'Debe indicar la patente o vincular un vehiculo existente.'
-                })
+        for campos, mensaje in _REQUERIDOS_POR_TIPO_PAGO.get(data.get('tipo'), ()):
+            if not any(data.get(campo) for campo in campos):
+                raise serializers.ValidationError({campos[0]: mensaje})
 
         return data
 
 
 class GastoAdministrativoSerializer(serializers.ModelSerializer):
     """Serializer para gastos administrativos."""
-    tipo_cuenta_display = serializers.CharField(source='get_tipo_cuenta_display', read_only=True)
+    tipo_cuenta_display = serializers.CharField(read_only=True)
 
     class Meta:
         model = GastoAdministrativo
@@ -89,15 +96,16 @@ class GastoAdministrativoSerializer(serializers.ModelSerializer):
 
 class ReservaListSerializer(serializers.ModelSerializer):
     """Serializer reducido para listados."""
-    tipo_operacion_display = serializers.CharField(source='get_tipo_operacion_display', read_only=True)
-    estado_display = serializers.CharField(source='get_estado_display', read_only=True)
+    tipo_operacion_display = serializers.CharField(read_only=True)
+    estado_display = serializers.CharField(read_only=True)
     color_operacion = serializers.CharField(read_only=True)
-    vehiculo_titulo = serializers.SerializerMethodField()
-    vehiculo_patente = serializers.SerializerMethodField()
-    cliente_nombre = serializers.SerializerMethodField()
-    cliente_dni = serializers.SerializerMethodField()
-    vendedor_1_nombre = serializers.SerializerMethodField()
-    moneda_nombre = serializers.SerializerMethodField()
+    vehiculo_titulo = serializers.CharField(source='vehiculo.titulo', read_only=True, allow_null=True)
+    vehiculo_patente = serializers.CharField(source='patente', read_only=True)
+    # Anotados por Reserva.objects.for_list()
+    cliente_nombre = serializers.CharField(read_only=True)
+    cliente_dni = serializers.CharField(source='cliente.dni_cuit', read_only=True)
+    vendedor_1_nombre = serializers.CharField(read_only=True)
+    moneda_nombre = serializers.CharField(source='moneda.nombre', read_only=True, allow_null=True)
     total_operacion = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
     total_pagado = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
     saldo_pendiente = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
@@ -118,30 +126,25 @@ class ReservaListSerializer(serializers.ModelSerializer):
             'created_at',
         ]
 
-    def get_vehiculo_titulo(self, obj):
-        return obj.vehiculo.titulo if obj.vehiculo else None
 
-    def get_vehiculo_patente(self, obj):
-        return obj.vehiculo.patente if obj.vehiculo else obj.dominio
+class ReservaEstadoSerializer(serializers.ModelSerializer):
+    """Respuesta compacta de las acciones que cambian el estado."""
+    estado_display = serializers.CharField(read_only=True)
 
-    def get_cliente_nombre(self, obj):
-        return obj.cliente.get_full_name()
-
-    def get_cliente_dni(self, obj):
-        return obj.cliente.dni_cuit
-
-    def get_vendedor_1_nombre(self, obj):
-        return obj.vendedor_1.get_full_name()
-
-    def get_moneda_nombre(self, obj):
-        return obj.moneda.nombre if obj.moneda else None
+    class Meta:
+        model = Reserva
+        fields = [
+            'id', 'numero_reserva', 'estado', 'estado_display',
+            'entregado', 'transferido', 'fecha_entrega_pactada', 'updated_at',
+        ]
+        read_only_fields = fields
 
 
 class ReservaSerializer(serializers.ModelSerializer):
     """Serializer completo para detalle, creacion y actualizacion."""
     # Campos de solo lectura expandidos
-    tipo_operacion_display = serializers.CharField(source='get_tipo_operacion_display', read_only=True)
-    estado_display = serializers.CharField(source='get_estado_display', read_only=True)
+    tipo_operacion_display = serializers.CharField(read_only=True)
+    estado_display = serializers.CharField(read_only=True)
     color_operacion = serializers.CharField(read_only=True)
     total_operacion = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
     total_pagado = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
@@ -163,6 +166,27 @@ class ReservaSerializer(serializers.ModelSerializer):
     gastos_administrativos = GastoAdministrativoSerializer(many=True, read_only=True)
     notas = NotaReservaSerializer(many=True, read_only=True)
 
+    # FKs que leen los campos *_nombre / *_detail
+    SELECT_RELATED = (
+        'vehiculo__marca',
+        'vehiculo__modelo',
+        'cliente',
+        'propietario_anterior',
+        'vendedor_1',
+        'vendedor_2',
+        'gestor_supervisor',
+        'creada_por',
+        'moneda',
+    )
+    # Relaciones que no son serializers anidados (vehiculo_detail)
+    PREFETCH_RELATED = (
+        Prefetch(
+            'vehiculo__imagenes',
+            queryset=ImagenVehiculo.objects.filter(es_principal=True),
+            to_attr='imagenes_principales'
+        ),
+    )
+
     class Meta:
         model = Reserva
         fields = [
@@ -200,14 +224,42 @@ class ReservaSerializer(serializers.ModelSerializer):
             'id', 'numero_reserva', 'creada_por', 'created_at', 'updated_at'
         ]
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """
+        Aplica los select/prefetch que necesita este serializer. Los
+        serializers anidados many=True se precargan a partir de su
+        declaracion, con los FKs que indique su SELECT_RELATED y lo que
+        agregue su propio setup_eager_loading.
+        """
+        prefetches = list(cls.PREFETCH_RELATED)
+        for name, field in cls._declared_fields.items():
+            if not isinstance(field, serializers.ListSerializer):
+                continue
+            child = field.child
+            child_queryset = child.Meta.model.objects.all()
+            # select_related() sin argumentos seguiria todos los FKs
+            if getattr(child, 'SELECT_RELATED', ()):
+                child_queryset = child_queryset.select_related(*child.SELECT_RELATED)
+            if hasattr(child, 'setup_eager_loading'):
+                child_queryset = child.setup_eager_loading(child_queryset)
+            prefetches.append(Prefetch(field.source or name, queryset=child_queryset))
+        return queryset.select_related(*cls.SELECT_RELATED).prefetch_related(*prefetches)
+
     def get_vehiculo_detail(self, obj):
         if obj.vehiculo:
+            # Precargada por setup_eager_loading; si no, una sola consulta
+            principales = getattr(obj.vehiculo, 'imagenes_principales', None)
+            if principales is None:
+                imagen = obj.vehiculo.imagenes.filter(es_principal=True).first()
+            else:
+                imagen = principales[0] if principales else None
             return {
                 'id': obj.vehiculo.id,
                 'titulo': obj.vehiculo.titulo,
                 'patente': obj.vehiculo.patente,
                 'precio': str(obj.vehiculo.precio),
-                'imagen_principal': obj.vehiculo.imagenes.filter(es_principal=True).first().imagen.url if obj.vehiculo.imagenes.filter(es_principal=True).exists() else None,
+                'imagen_principal': imagen.imagen.url if imagen else None,
             }
         return None
 
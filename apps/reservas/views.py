@@ -2,9 +2,12 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.pagination import CursorPagination
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Sum, Count
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q, Sum
 from django.utils import timezone
 
 from .models import (
@@ -15,11 +18,33 @@ from .serializers import (
     ReservaSerializer,
     ReservaListSerializer,
     ReservaCreateSerializer,
+    ReservaEstadoSerializer,
     FormaPagoSerializer,
     GastoAdministrativoSerializer,
     NotaReservaSerializer,
 )
+from apps.api.renderers import ORJSONRenderer
+from apps.vehiculos.models import Vehiculo
 from .filters import ReservaFilter
+from .cache import cache_estadisticas, clave_estadisticas
+
+
+class ReservaCursorPagination(CursorPagination):
+    """
+    Paginacion por cursor (keyset): cada pagina busca desde la ultima fila
+    vista en lugar de saltear filas con OFFSET. Es opcional: sin ?cursor ni
+    ?page_size el listado sigue respondiendo la lista completa.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    ordering = '-created_at'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+        return super().paginate_queryset(queryset, request, view)
 
 
 class ReservaViewSet(viewsets.ModelViewSet):
@@ -44,6 +69,10 @@ class ReservaViewSet(viewsets.ModelViewSet):
     - PATCH /api/reservas/{id}/cambiar-estado/ - Cambiar estado
     - PATCH /api/reservas/{id}/marcar-entregado/ - Marcar como entregado
     - PATCH /api/reservas/{id}/marcar-transferido/ - Marcar transferencia realizada
+    - PATCH /api/reservas/{id}/anular/ - Anular reserva
+
+    Las acciones de estado responden con la reserva completa; con
+    ?compacto=true responden solo id, numero, estado y flags.
 
     Filtros:
     - ?tipo_operacion=used|new|external
@@ -61,8 +90,13 @@ class ReservaViewSet(viewsets.ModelViewSet):
     - ?activas=true
     - ?search=texto
     - ?ordering=-created_at,precio_venta
+
+    Paginacion (opcional):
+    - ?page_size=50 - Primera pagina; la respuesta trae next/previous
+    - ?cursor=... - Pagina siguiente/anterior (usar las URLs next/previous)
     """
     permission_classes = [IsAuthenticated]
+    pagination_class = ReservaCursorPagination
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_class = ReservaFilter
     search_fields = [
@@ -81,32 +115,71 @@ class ReservaViewSet(viewsets.ModelViewSet):
     ]
     ordering = ['-created_at']
 
+    # Acciones que no serializan la reserva: no necesitan joins ni prefetch
+    ACCIONES_SIN_DETALLE = (
+        'destroy',
+        'estadisticas',
+        'agregar_forma_pago',
+        'eliminar_forma_pago',
+        'agregar_gasto',
+        'eliminar_gasto',
+        'agregar_nota',
+    )
+
+    # Acciones de cambio de estado (responden segun ?compacto)
+    ACCIONES_ESTADO = (
+        'cambiar_estado',
+        'marcar_entregado',
+        'marcar_transferido',
+        'anular',
+    )
+
+    def get_renderers(self):
+        # El listado sin paginar es grande: se codifica con orjson salvo que
+        # RESERVAS_ORJSON lo desactive
+        if settings.RESERVAS_ORJSON:
+            return [ORJSONRenderer()]
+        return super().get_renderers()
+
     def get_queryset(self):
-        """Retorna queryset optimizado."""
-        return Reserva.objects.select_related(
-            'vehiculo',
-            'vehiculo__marca',
-            'vehiculo__modelo',
-            'cliente',
-            'propietario_anterior',
-            'vendedor_1',
-            'vendedor_2',
-            'gestor_supervisor',
-            'creada_por',
-            'moneda',
-        ).prefetch_related(
-            'formas_pago',
-            'formas_pago__sena_recibida_por',
-            'gastos_administrativos',
-            'notas__autor',
-            'vehiculo__imagenes',
+        """
+        Retorna queryset optimizado segun la accion.
+        Las relaciones anidadas solo se precargan en las acciones que
+        responden con ReservaSerializer, segun lo que declara el serializer.
+        """
+        if self.action == 'list':
+            return Reserva.objects.for_list()
+        if self.action in self.ACCIONES_SIN_DETALLE:
+            return Reserva.objects.all()
+        if self.action in self.ACCIONES_ESTADO and self._respuesta_compacta():
+            # ReservaEstadoSerializer solo lee columnas propias
+            return Reserva.objects.all()
+        return ReservaSerializer.setup_eager_loading(
+            Reserva.objects.with_totales()
         )
 
+    def _respuesta_compacta(self):
+        compacto = self.request.query_params.get('compacto', 'false')
+        return compacto.lower() == 'true'
+
+    def _respuesta_estado(self, reserva):
+        """Respuesta de las acciones de estado (completa o compacta)."""
+        if self._respuesta_compacta():
+            return Response(ReservaEstadoSerializer(reserva).data)
+        serializer = ReservaSerializer(reserva, context={'request': self.request})
+        return Response(serializer.data)
+
     def get_serializer_class(self):
         if self.action == 'list':
             return ReservaListSerializer
         if self.action == 'create':
             return ReservaCreateSerializer
+        if self.action == 'agregar_forma_pago':
+            return FormaPagoSerializer
+        if self.action == 'agregar_gasto':
+            return GastoAdministrativoSerializer
+        if self.action == 'agregar_nota':
+            return NotaReservaSerializer
         return ReservaSerializer
 
     # =========================================================================
@@ -115,54 +188,62 @@ class ReservaViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def estadisticas(self, request):
-        """Retorna estadisticas del dashboard."""
+        """
+        Retorna estadisticas del dashboard.
+        Se cachean por combinacion de filtros hasta la proxima escritura de
+        una reserva (o RESERVAS_ESTADISTICAS_CACHE_TIMEOUT segundos).
+        """
         hoy = timezone.localdate()
-
-        queryset = self.filter_queryset(self.get_queryset())
-
-        # Totales por estado
-        por_estado = {}
-        for estado in EstadoReserva.values:
-            por_estado[estado] = queryset.filter(estado=estado).count()
-
-        # Totales por tipo
-        por_tipo = {}
-        for tipo in TipoOperacion.values:
-            por_tipo[tipo] = queryset.filter(tipo_operacion=tipo).count()
-
-        # Total general
-        total = queryset.count()
-
-        # Entregas para hoy
-        entregas_hoy = queryset.filter(
-            fecha_entrega_pactada=hoy,
-            estado=EstadoReserva.PENDING
-        ).count()
-
-        # Total facturado (reservas activas)
-        total_facturado = queryset.filter(
-            estado__in=[EstadoReserva.PENDING, EstadoReserva.DELIVERED]
-        ).aggregate(total=Sum('precio_venta'))['total'] or 0
-
-        # Resumen de comisiones
-        comisiones = queryset.filter(
-            estado__in=[EstadoReserva.PENDING, EstadoReserva.DELIVERED]
-        ).aggregate(
-            comision_vendedor=Sum('comision_vendedor'),
-            comision_comprador=Sum('comision_comprador'),
+        clave = clave_estadisticas(request.query_params, hoy)
+        data = cache_estadisticas.get(clave)
+        if data is None:
+            data = self._calcular_estadisticas(request, hoy)
+            cache_estadisticas.set(clave, data, settings.RESERVAS_ESTADISTICAS_CACHE_TIMEOUT)
+        return Response(data)
+
+    def _calcular_estadisticas(self, request, hoy):
+        """Calcula las estadisticas sobre el queryset filtrado."""
+        queryset = self.filter_queryset(self.get_queryset()).order_by()
+
+        # Todo en una sola consulta: conteos condicionales por estado y por
+        # tipo, mas totales, entregas de hoy y montos de reservas activas
+        activas = Q(estado__in=[EstadoReserva.PENDING, EstadoReserva.DELIVERED])
+        totales = queryset.aggregate(
+            **{
+                f'estado_{estado}': Count('id', filter=Q(estado=estado))
+                for estado in EstadoReserva.values
+            },
+            **{
+                f'tipo_{tipo}': Count('id', filter=Q(tipo_operacion=tipo))
+                for tipo in TipoOperacion.values
+            },
+            total=Count('id'),
+            entregas_hoy=Count('id', filter=Q(
+                fecha_entrega_pactada=hoy,
+                estado=EstadoReserva.PENDING
+            )),
+            total_facturado=Sum('precio_venta', filter=activas),
+            comision_vendedor=Sum('comision_vendedor', filter=activas),
+            comision_comprador=Sum('comision_comprador', filter=activas),
         )
 
-        return Response({
-            'total': total,
-            'por_estado': por_estado,
-            'por_tipo': por_tipo,
-            'entregas_hoy': entregas_hoy,
-            'total_facturado': str(total_facturado),
+        return {
+            'total': totales['total'],
+            'por_estado': {
+                estado: totales[f'estado_{estado}']
+                for estado in EstadoReserva.values
+            },
+            'por_tipo': {
+                tipo: totales[f'tipo_{tipo}']
+                for tipo in TipoOperacion.values
+            },
+            'entregas_hoy': totales['entregas_hoy'],
+            'total_facturado': str(totales['total_facturado'] or 0),
             'comisiones': {
-                'vendedor': str(comisiones['comision_vendedor'] or 0),
-                'comprador': str(comisiones['comision_comprador'] or 0),
+                'vendedor': str(totales['comision_vendedor'] or 0),
+                'comprador': str(totales['comision_comprador'] or 0),
             }
-        })
+        }
 
     # =========================================================================
     # FORMAS DE PAGO
@@ -172,17 +253,15 @@ class ReservaViewSet(viewsets.ModelViewSet):
     def agregar_forma_pago(self, request, pk=None):
         """Agrega una forma de pago a la reserva."""
         reserva = self.get_object()
-        serializer = FormaPagoSerializer(data=request.data)
-
-        if serializer.is_valid():
-            serializer.save(reserva=reserva)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save(reserva=reserva)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     @action(
         detail=True,
         methods=['delete'],
-        url_path='formas-pago/(?P<fp_id>[^/.]+)'
+        url_path='formas-pago/(?P<fp_id>[0-9]+)'
     )
     def eliminar_forma_pago(self, request, pk=None, fp_id=None):
         """Elimina una forma de pago."""
@@ -212,16 +291,15 @@ class ReservaViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        serializer = GastoAdministrativoSerializer(data=request.data)
-        if serializer.is_valid():
-            serializer.save(reserva=reserva)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save(reserva=reserva)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     @action(
         detail=True,
         methods=['delete'],
-        url_path='gastos/(?P<g_id>[^/.]+)'
+        url_path='gastos/(?P<g_id>[0-9]+)'
     )
     def eliminar_gasto(self, request, pk=None, g_id=None):
         """Elimina un gasto administrativo."""
@@ -244,12 +322,10 @@ class ReservaViewSet(viewsets.ModelViewSet):
     def agregar_nota(self, request, pk=None):
         """Agrega una nota de seguimiento."""
         reserva = self.get_object()
-        serializer = NotaReservaSerializer(data=request.data)
-
-        if serializer.is_valid():
-            serializer.save(reserva=reserva, autor=request.user)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save(reserva=reserva, autor=request.user)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     # =========================================================================
     # CAMBIOS DE ESTADO
@@ -270,8 +346,7 @@ class ReservaViewSet(viewsets.ModelViewSet):
         reserva.estado = nuevo_estado
         reserva.save(update_fields=['estado', 'updated_at'])
 
-        serializer = ReservaSerializer(reserva, context={'request': request})
-        return Response(serializer.data)
+        return self._respuesta_estado(reserva)
 
     @action(detail=True, methods=['patch'], url_path='marcar-entregado')
     def marcar_entregado(self, request, pk=None):
@@ -284,19 +359,21 @@ class ReservaViewSet(viewsets.ModelViewSet):
         if not reserva.fecha_entrega_pactada:
             reserva.fecha_entrega_pactada = timezone.localdate()
 
-        reserva.save(update_fields=['entregado', 'estado', 'fecha_entrega_pactada', 'updated_at'])
+        # Reserva y vehiculo cambian juntos o no cambia ninguno; el vehiculo
+        # se actualiza por pk, sin cargarlo (no tiene logica en save)
+        with transaction.atomic():
+            reserva.save(update_fields=['entregado', 'estado', 'fecha_entrega_pactada', 'updated_at'])
 
-        # Si hay vehiculo, marcarlo como vendido
-        if reserva.vehiculo:
-            reserva.vehiculo.vendido = True
-            reserva.vehiculo.reservado = False
-            reserva.vehiculo.mostrar_en_web = False
-            reserva.vehiculo.save(update_fields=[
-                'vendido', 'reservado', 'mostrar_en_web', 'updated_at'
-            ])
+            # Si hay vehiculo, marcarlo como vendido
+            if reserva.vehiculo_id:
+                Vehiculo.objects.filter(pk=reserva.vehiculo_id).update(
+                    vendido=True,
+                    reservado=False,
+                    mostrar_en_web=False,
+                    updated_at=timezone.now()
+                )
 
-        serializer = ReservaSerializer(reserva, context={'request': request})
-        return Response(serializer.data)
+        return self._respuesta_estado(reserva)
 
     @action(detail=True, methods=['patch'], url_path='marcar-transferido')
     def marcar_transferido(self, request, pk=None):
@@ -305,8 +382,7 @@ class ReservaViewSet(viewsets.ModelViewSet):
         reserva.transferido = True
         reserva.save(update_fields=['transferido', 'updated_at'])
 
-        serializer = ReservaSerializer(reserva, context={'request': request})
-        return Response(serializer.data)
+        return self._respuesta_estado(reserva)
 
     @action(detail=True, methods=['patch'], url_path='anular')
     def anular(self, request, pk=None):
@@ -319,12 +395,14 @@ class ReservaViewSet(viewsets.ModelViewSet):
         else:
             reserva.estado = EstadoReserva.CANCELLED
 
-        reserva.save(update_fields=['estado', 'updated_at'])
+        with transaction.atomic():
+            reserva.save(update_fields=['estado', 'updated_at'])
 
-        # Si hay vehiculo, liberarlo
-        if reserva.vehiculo:
-            reserva.vehiculo.reservado = False
-            reserva.vehiculo.save(update_fields=['reservado', 'updated_at'])
+            # Si hay vehiculo, liberarlo
+            if reserva.vehiculo_id:
+                Vehiculo.objects.filter(pk=reserva.vehiculo_id).update(
+                    reservado=False,
+                    updated_at=timezone.now()
+                )
 
-        serializer = ReservaSerializer(reserva, context={'request': request})
-        return Response(serializer.data)
+        return self._respuesta_estado(reserva)
@@ -17,6 +17,13 @@ class ReunionAdmin(admin.ModelAdmin):
         'estado',
         'created_at',
     ]
+    # coordinador, vendedor_display y vehiculo (__str__ lee marca y modelo)
+    list_select_related = (
+        'coordinador',
+        'vendedor',
+        'vehiculo__marca',
+        'vehiculo__modelo',
+    )
     list_filter = [
         'fecha',
         'ubicacion',
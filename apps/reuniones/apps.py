@@ -5,3 +5,6 @@ class ReunionesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.reuniones'
     verbose_name = 'Reuniones'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,20 @@
+"""
+Cache de las estadisticas de reuniones.
+
+Solo dependen del dia, por lo que hay una unica entrada por fecha; cada
+escritura de una reunion borra la del dia actual.
+"""
+from django.core.cache import caches
+from django.utils import timezone
+
+# Cache propia (CACHES['estadisticas']), compartida entre workers
+cache_estadisticas = caches['estadisticas']
+
+
+def clave_estadisticas(hoy):
+    return f'reuniones:estadisticas:{hoy.isoformat()}'
+
+
+def invalidar_estadisticas():
+    """Borra las estadisticas cacheadas del dia."""
+    cache_estadisticas.delete(clave_estadisticas(timezone.localdate()))
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reuniones', '0001_initial'),
+        ('vehiculos', '0002_vehiculo_tipo_vehiculo'),
+        ('vendedores', '0002_email_opcional'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='reunion',
+            name='reuniones_r_fecha_587727_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='reunion',
+            name='reuniones_r_ubicaci_f26296_idx',
+        ),
+        migrations.AddIndex(
+            model_name='reunion',
+            index=models.Index(fields=['fecha', 'estado'], name='reunion_fecha_estado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reunion',
+            index=models.Index(fields=['ubicacion', 'fecha'], name='reunion_ubicacion_fecha_idx'),
+        ),
+    ]
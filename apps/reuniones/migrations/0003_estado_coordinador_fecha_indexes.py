@@ -0,0 +1,45 @@
+# Generated by Django 5.2.8 on 2026-10-15 23:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reuniones', '0002_fecha_estado_indexes'),
+        ('vehiculos', '0002_vehiculo_tipo_vehiculo'),
+        ('vendedores', '0002_email_opcional'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='reunion',
+            name='reuniones_r_estado_d4bae1_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='reunion',
+            name='reuniones_r_coordin_4be0af_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='reunion',
+            name='reuniones_r_vendedo_4b3747_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='reunion',
+            name='reuniones_r_vehicul_fee4cf_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='reunion',
+            name='reunion_fecha_estado_idx',
+        ),
+        migrations.AddIndex(
+            model_name='reunion',
+            index=models.Index(fields=['estado', 'fecha'], name='reunion_estado_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reunion',
+            index=models.Index(fields=['coordinador', 'fecha'], name='reunion_coordinador_fecha_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-15 23:03
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.conf import settings
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reuniones', '0003_estado_coordinador_fecha_indexes'),
+        ('vehiculos', '0002_vehiculo_tipo_vehiculo'),
+        ('vendedores', '0002_email_opcional'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='reunion',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('comprador_nombre'), name='gin_trgm_ops'), name='reunion_comprador_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='reunion',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('vendedor_texto'), name='gin_trgm_ops'), name='reunion_vendedor_texto_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='reunion',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('notas'), name='gin_trgm_ops'), name='reunion_notas_trgm'),
+        ),
+    ]
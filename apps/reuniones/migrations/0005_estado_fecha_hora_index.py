@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-15 23:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reuniones', '0004_search_trigram_indexes'),
+        ('vehiculos', '0002_vehiculo_tipo_vehiculo'),
+        ('vendedores', '0002_email_opcional'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='reunion',
+            name='reunion_estado_fecha_idx',
+        ),
+        migrations.AddIndex(
+            model_name='reunion',
+            index=models.Index(fields=['estado', 'fecha', 'hora'], name='reunion_estado_fecha_hora_idx'),
+        ),
+    ]
@@ -1,6 +1,33 @@
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import models, transaction
+from django.db.models.functions import Upper
 from django.utils.translation import gettext_lazy as _
 
+from .cache import invalidar_estadisticas
+
+
+class ReunionQuerySet(models.QuerySet):
+
+    def bulk_create_reuniones(self, rows, batch_size=1000):
+        """
+        Crea reuniones a partir de dicts de campos (importaciones desde un
+        calendario, cargas iniciales) con INSERTs de a batch_size filas en
+        lugar de uno por reunion.
+        """
+        creadas = self.bulk_create(
+            [self.model(**row) for row in rows],
+            batch_size=batch_size
+        )
+        # bulk_create no envia post_save (ver signals.py)
+        transaction.on_commit(invalidar_estadisticas)
+        return creadas
+
+    def update(self, **kwargs):
+        filas = super().update(**kwargs)
+        # update() no envia post_save (ver signals.py)
+        transaction.on_commit(invalidar_estadisticas)
+        return filas
+
 
 class Reunion(models.Model):
     """
@@ -112,26 +139,54 @@ class Reunion(models.Model):
         auto_now=True
     )
 
+    objects = ReunionQuerySet.as_manager()
+
     class Meta:
         ordering = ['fecha', 'hora']
         verbose_name = _('Reunion')
         verbose_name_plural = _('Reuniones')
         indexes = [
-            models.Index(fields=['fecha']),
+            # (fecha) es prefijo del indice de orden del listado
             models.Index(fields=['fecha', 'hora']),
-            models.Index(fields=['ubicacion']),
-            models.Index(fields=['estado']),
-            models.Index(fields=['coordinador']),
-            models.Index(fields=['vendedor']),
-            models.Index(fields=['vehiculo']),
+            # estado por igualdad y fecha por rango (estadisticas, ?pendientes);
+            # con hora, ?pendientes sale en el orden del listado sin Sort
+            models.Index(fields=['estado', 'fecha', 'hora'], name='reunion_estado_fecha_hora_idx'),
+            models.Index(fields=['ubicacion', 'fecha'], name='reunion_ubicacion_fecha_idx'),
+            models.Index(fields=['coordinador', 'fecha'], name='reunion_coordinador_fecha_idx'),
+            # vendedor y vehiculo ya tienen el indice de la FK
+            # ?search (icontains -> UPPER(col) LIKE '%...%'): un indice
+            # trigram por campo de search_fields, combinables en el OR
+            GinIndex(
+                OpClass(Upper('comprador_nombre'), name='gin_trgm_ops'),
+                name='reunion_comprador_trgm',
+            ),
+            GinIndex(
+                OpClass(Upper('vendedor_texto'), name='gin_trgm_ops'),
+                name='reunion_vendedor_texto_trgm',
+            ),
+            GinIndex(
+                OpClass(Upper('notas'), name='gin_trgm_ops'),
+                name='reunion_notas_trgm',
+            ),
         ]
 
     def __str__(self):
-        return f"{self.fecha} {self.hora} - {self.comprador_nombre} ({self.get_ubicacion_display()})"
+        return f"{self.fecha} {self.hora} - {self.comprador_nombre} ({self.ubicacion_display})"
+
+    @property
+    def ubicacion_display(self):
+        return _UBICACION_DISPLAY.get(self.ubicacion, self.ubicacion)
+
+    @property
+    def estado_display(self):
+        return _ESTADO_DISPLAY.get(self.estado, self.estado)
 
     @property
     def vendedor_display(self):
         """Retorna el nombre del vendedor (FK o texto libre)."""
+        # Anotado en el listado (ReunionViewSet.get_queryset)
+        if hasattr(self, '_vendedor_display'):
+            return self._vendedor_display
         if self.vendedor:
             return f"{self.vendedor.nombre} {self.vendedor.apellido}"
         return self.vendedor_texto or "Sin asignar"
@@ -152,3 +207,8 @@ class Reunion(models.Model):
         """Marca la reunion como cancelada."""
         self.estado = self.Estado.CANCELADA
         self.save(update_fields=['estado', 'updated_at'])
+
+
+# Ver reservas.models._TIPO_OPERACION_DISPLAY
+_UBICACION_DISPLAY = dict(Reunion.Ubicacion.choices)
+_ESTADO_DISPLAY = dict(Reunion.Estado.choices)
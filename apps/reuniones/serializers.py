@@ -1,22 +1,18 @@
 from rest_framework import serializers
 from django.utils.translation import gettext_lazy as _
 
+from apps.api.serializers import CachedFieldsMixin
 from .models import Reunion
 
 
-class ReunionListSerializer(serializers.ModelSerializer):
+class ReunionListSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Serializer reducido para listados.
     """
-    ubicacion_display = serializers.CharField(
-        source='get_ubicacion_display',
-        read_only=True
-    )
-    estado_display = serializers.CharField(
-        source='get_estado_display',
-        read_only=True
-    )
-    coordinador_nombre = serializers.SerializerMethodField()
+    ubicacion_display = serializers.CharField(read_only=True)
+    estado_display = serializers.CharField(read_only=True)
+    # Anotado por ReunionViewSet.get_queryset()
+    coordinador_nombre = serializers.CharField(read_only=True)
     vendedor_display = serializers.CharField(read_only=True)
     vehiculo_display = serializers.CharField(read_only=True)
     vehiculo_titulo = serializers.CharField(
@@ -51,25 +47,23 @@ class ReunionListSerializer(serializers.ModelSerializer):
             'created_at',
         ]
 
-    def get_coordinador_nombre(self, obj):
-        return obj.coordinador.get_full_name()
 
-
-class ReunionSerializer(serializers.ModelSerializer):
+class ReunionSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Serializer completo para detalle, creacion y actualizacion.
     """
-    ubicacion_display = serializers.CharField(
-        source='get_ubicacion_display',
-        read_only=True
-    )
-    estado_display = serializers.CharField(
-        source='get_estado_display',
+    ubicacion_display = serializers.CharField(read_only=True)
+    estado_display = serializers.CharField(read_only=True)
+    coordinador_nombre = serializers.CharField(
+        source='coordinador.get_full_name',
         read_only=True
     )
-    coordinador_nombre = serializers.SerializerMethodField()
     vendedor_display = serializers.CharField(read_only=True)
-    vendedor_nombre = serializers.SerializerMethodField()
+    vendedor_nombre = serializers.CharField(
+        source='vendedor.get_full_name',
+        read_only=True,
+        allow_null=True
+    )
     vehiculo_display = serializers.CharField(read_only=True)
     vehiculo_titulo = serializers.CharField(
         source='vehiculo.titulo',
@@ -79,7 +73,10 @@ class ReunionSerializer(serializers.ModelSerializer):
         source='vehiculo.patente',
         read_only=True
     )
-    creada_por_nombre = serializers.SerializerMethodField()
+    creada_por_nombre = serializers.CharField(
+        source='creada_por.get_full_name',
+        read_only=True
+    )
 
     class Meta:
         model = Reunion
@@ -108,6 +105,8 @@ class ReunionSerializer(serializers.ModelSerializer):
             'created_at',
             'updated_at',
         ]
+        # Vendedor: FK o texto libre; sin ninguno es valido (sin asignar) y
+        # con ambos prevalece el FK (ver Reunion.vendedor_display)
         read_only_fields = [
             'id',
             'creada_por',
@@ -115,27 +114,6 @@ class ReunionSerializer(serializers.ModelSerializer):
             'updated_at',
         ]
 
-    def get_coordinador_nombre(self, obj):
-        return obj.coordinador.get_full_name()
-
-    def get_vendedor_nombre(self, obj):
-        if obj.vendedor:
-            return f"{obj.vendedor.nombre} {obj.vendedor.apellido}"
-        return None
-
-    def get_creada_por_nombre(self, obj):
-        return obj.creada_por.get_full_name()
-
-    def validate(self, attrs):
-        """Validaciones de negocio."""
-        vendedor = attrs.get('vendedor')
-        vendedor_texto = attrs.get('vendedor_texto', '')
-
-        # Si no hay vendedor FK ni texto, es valido (sin vendedor asignado)
-        # Si hay ambos, priorizar el FK
-
-        return attrs
-
 
 class ReunionCreateSerializer(ReunionSerializer):
     """
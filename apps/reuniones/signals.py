@@ -0,0 +1,20 @@
+"""
+Invalidacion del cache de estadisticas.
+
+post_save y post_delete se envian tambien por cada objeto en los delete()
+de queryset (ej. la accion delete_selected del admin), que no pasan por
+Reunion.delete().
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidar_estadisticas
+from .models import Reunion
+
+
+@receiver(post_save, sender=Reunion, dispatch_uid='reuniones_estadisticas_post_save')
+@receiver(post_delete, sender=Reunion, dispatch_uid='reuniones_estadisticas_post_delete')
+def invalidar_estadisticas_reunion(sender, **kwargs):
+    # Despues del commit, para no cachear datos previos a la escritura
+    transaction.on_commit(invalidar_estadisticas)
@@ -4,9 +4,15 @@ from rest_framework.response import Response
 from rest_framework.filters import SearchFilter, OrderingFilter
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
+from django.conf import settings
+from django.db.models import Case, CharField, Count, F, Prefetch, Q, Value, When
+from django.db.models.functions import Concat, Trim
+from django.http import Http404, StreamingHttpResponse
 from django.utils import timezone
 from datetime import timedelta
 
+from apps.api.renderers import ORJSONRenderer
+from apps.vehiculos.models import Vehiculo
 from .models import Reunion
 from .serializers import (
     ReunionSerializer,
@@ -15,6 +21,7 @@ from .serializers import (
     ReunionEstadisticasSerializer,
 )
 from .filters import ReunionFilter
+from .cache import cache_estadisticas, clave_estadisticas
 
 
 class ReunionViewSet(viewsets.ModelViewSet):
@@ -35,6 +42,12 @@ class ReunionViewSet(viewsets.ModelViewSet):
     - PATCH /api/reuniones/{id}/marcar-completada/ - Marcar como completada
     - PATCH /api/reuniones/{id}/marcar-cancelada/ - Marcar como cancelada
 
+    Las acciones marcar-* responden con la reunion completa; con
+    ?compacto=true hacen un UPDATE directo y responden id y estado.
+
+    El listado con ?stream=true (vista de calendario, exportaciones) se
+    envia por partes, leyendo la consulta con un cursor del servidor.
+
     Filtros:
     - ?fecha=2024-12-24
     - ?fecha_desde=X&fecha_hasta=Y
@@ -54,11 +67,61 @@ class ReunionViewSet(viewsets.ModelViewSet):
     search_fields = ['comprador_nombre', 'vendedor_texto', 'notas']
     ordering_fields = ['fecha', 'hora', 'created_at', 'ubicacion', 'estado']
     ordering = ['fecha', 'hora']
+    # El UPDATE de las acciones compactas filtra por pk sin pasar por get_object
+    lookup_value_regex = '[0-9]+'
+
+    # Acciones que no serializan la reunion: no necesitan joins
+    ACCIONES_SIN_DETALLE = (
+        'destroy',
+        'estadisticas',
+    )
+
+    # Acciones que responden con ReunionListSerializer
+    ACCIONES_LISTADO = (
+        'list',
+        'por_fecha',
+    )
 
     def get_queryset(self):
         """
         Retorna queryset optimizado con select_related.
+        Las acciones que no serializan la reunion usan el queryset sin joins.
         """
+        if self.action in self.ACCIONES_SIN_DETALLE:
+            return Reunion.objects.all()
+        if self.action in self.ACCIONES_LISTADO:
+            # Solo las columnas que lee ReunionListSerializer. Los vehiculos
+            # se traen aparte, una vez cada uno (varias reuniones suelen
+            # compartir vehiculo), en lugar de repetirlos en cada fila
+            return Reunion.objects.only(
+                'id', 'fecha', 'hora', 'ubicacion', 'estado', 'coordinador',
+                'comprador_nombre', 'vendedor', 'vendedor_texto', 'created_at',
+                'vehiculo',
+            ).annotate(
+                # Mismo formato que Usuario.get_full_name()
+                coordinador_nombre=Trim(Concat(
+                    'coordinador__first_name', Value(' '), 'coordinador__last_name',
+                    output_field=CharField()
+                )),
+                # Mismo resultado que Reunion.vendedor_display
+                _vendedor_display=Case(
+                    When(vendedor__isnull=False, then=Concat(
+                        'vendedor__nombre', Value(' '), 'vendedor__apellido'
+                    )),
+                    When(vendedor_texto='', then=Value('Sin asignar')),
+                    default=F('vendedor_texto'),
+                    output_field=CharField()
+                ),
+            ).prefetch_related(
+                Prefetch(
+                    'vehiculo',
+                    # Vehiculo.titulo y patente
+                    queryset=Vehiculo.objects.select_related('marca', 'modelo').only(
+                        'id', 'version', 'anio', 'patente',
+                        'marca__nombre', 'modelo__nombre',
+                    )
+                )
+            )
         return Reunion.objects.select_related(
             'coordinador',
             'vendedor',
@@ -77,6 +140,39 @@ class ReunionViewSet(viewsets.ModelViewSet):
             return ReunionEstadisticasSerializer
         return ReunionSerializer
 
+    # Filas que se leen del cursor (y se serializan) por vez al hacer stream
+    STREAM_CHUNK_SIZE = 500
+
+    def list(self, request, *args, **kwargs):
+        if request.query_params.get('stream', 'false').lower() != 'true':
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        response = StreamingHttpResponse(
+            self._stream_listado(queryset),
+            content_type='application/json'
+        )
+        response['Cache-Control'] = 'no-cache'
+        return response
+
+    def _stream_listado(self, queryset):
+        """
+        Genera el mismo array JSON que list() sin cargar todas las reuniones:
+        iterator() usa un cursor del servidor y el prefetch de vehiculos se
+        resuelve por tanda.
+        """
+        renderer = ORJSONRenderer()
+        serializer_class = self.get_serializer_class()
+        context = self.get_serializer_context()
+
+        yield b'['
+        separador = b''
+        for reunion in queryset.iterator(chunk_size=self.STREAM_CHUNK_SIZE):
+            data = serializer_class(reunion, context=context).data
+            yield separador + renderer.render(data)
+            separador = b','
+        yield b']'
+
     # =========================================================================
     # ACCIONES EXTRA
     # =========================================================================
@@ -85,9 +181,21 @@ class ReunionViewSet(viewsets.ModelViewSet):
     def estadisticas(self, request):
         """
         Retorna el conteo de reuniones para hoy, manana, semana y mes.
-        Solo cuenta reuniones pendientes.
+        Solo cuenta reuniones pendientes. Se cachea por dia hasta la proxima
+        escritura de una reunion (o REUNIONES_ESTADISTICAS_CACHE_TIMEOUT).
         """
         hoy = timezone.localdate()
+        clave = clave_estadisticas(hoy)
+        stats = cache_estadisticas.get(clave)
+        if stats is None:
+            stats = self._calcular_estadisticas(hoy)
+            cache_estadisticas.set(clave, stats, settings.REUNIONES_ESTADISTICAS_CACHE_TIMEOUT)
+
+        serializer = ReunionEstadisticasSerializer(stats)
+        return Response(serializer.data)
+
+    def _calcular_estadisticas(self, hoy):
+        """Cuenta las reuniones pendientes de cada periodo."""
         manana = hoy + timedelta(days=1)
 
         # Inicio de la semana (lunes)
@@ -101,31 +209,19 @@ class ReunionViewSet(viewsets.ModelViewSet):
         else:
             fin_mes = hoy.replace(month=hoy.month + 1, day=1) - timedelta(days=1)
 
-        queryset = self.get_queryset()
-
-        stats = {
-            'hoy': queryset.filter(
-                fecha=hoy,
-                estado=Reunion.Estado.PENDIENTE
-            ).count(),
-            'manana': queryset.filter(
-                fecha=manana,
-                estado=Reunion.Estado.PENDIENTE
-            ).count(),
-            'semana': queryset.filter(
-                fecha__gte=inicio_semana,
-                fecha__lte=fin_semana,
-                estado=Reunion.Estado.PENDIENTE
-            ).count(),
-            'mes': queryset.filter(
-                fecha__gte=inicio_mes,
-                fecha__lte=fin_mes,
-                estado=Reunion.Estado.PENDIENTE
-            ).count(),
-        }
-
-        serializer = ReunionEstadisticasSerializer(stats)
-        return Response(serializer.data)
+        # Una sola consulta: se acota al rango que cubre todos los periodos
+        # (la semana y manana pueden caer fuera del mes) y cada periodo se
+        # cuenta con un COUNT condicional. Sin joins: solo se cuentan filas
+        return Reunion.objects.filter(
+            estado=Reunion.Estado.PENDIENTE,
+            fecha__gte=min(inicio_mes, inicio_semana),
+            fecha__lte=max(fin_mes, fin_semana, manana),
+        ).aggregate(
+            hoy=Count('id', filter=Q(fecha=hoy)),
+            manana=Count('id', filter=Q(fecha=manana)),
+            semana=Count('id', filter=Q(fecha__gte=inicio_semana, fecha__lte=fin_semana)),
+            mes=Count('id', filter=Q(fecha__gte=inicio_mes, fecha__lte=fin_mes)),
+        )
 
     @action(detail=False, methods=['get'], url_path='por-fecha/(?P<fecha>[0-9]{4}-[0-9]{2}-[0-9]{2})')
     def por_fecha(self, request, fecha=None):
@@ -139,6 +235,8 @@ class ReunionViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['patch'], url_path='marcar-completada')
     def marcar_completada(self, request, pk=None):
         """Marca la reunion como completada."""
+        if self._respuesta_compacta():
+            return self._marcar_estado_compacto(pk, Reunion.Estado.COMPLETADA)
         reunion = self.get_object()
         reunion.marcar_completada()
         serializer = ReunionSerializer(reunion, context={'request': request})
@@ -147,7 +245,31 @@ class ReunionViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['patch'], url_path='marcar-cancelada')
     def marcar_cancelada(self, request, pk=None):
         """Marca la reunion como cancelada."""
+        if self._respuesta_compacta():
+            return self._marcar_estado_compacto(pk, Reunion.Estado.CANCELADA)
         reunion = self.get_object()
         reunion.marcar_cancelada()
         serializer = ReunionSerializer(reunion, context={'request': request})
         return Response(serializer.data)
+
+    def _respuesta_compacta(self):
+        compacto = self.request.query_params.get('compacto', 'false')
+        return compacto.lower() == 'true'
+
+    def _marcar_estado_compacto(self, pk, estado):
+        """
+        Cambia el estado con un UPDATE directo, sin leer la reunion, y
+        responde solo con id y estado.
+        """
+        actualizadas = Reunion.objects.filter(pk=pk).update(
+            estado=estado,
+            updated_at=timezone.now()
+        )
+        if not actualizadas:
+            raise Http404
+        # ReunionQuerySet.update() invalida las estadisticas
+        return Response({
+            'id': int(pk),
+            'estado': estado.value,
+            'estado_display': estado.label,
+        })
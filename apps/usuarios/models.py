@@ -75,6 +75,12 @@ class Usuario(AbstractUser):
 
     def save(self, *args, **kwargs):
         """Asigna is_staff=True para que puedan acceder al admin."""
-        if self.rol in [self.Rol.ADMIN, self.Rol.STAFF]:
-            self.is_staff = True
+        update_fields = kwargs.get('update_fields')
+        # Los guardados parciales sin rol (ej. last_login al loguearse) no
+        # escriben is_staff
+        if update_fields is None or 'rol' in update_fields:
+            if self.rol in [self.Rol.ADMIN, self.Rol.STAFF] and not self.is_staff:
+                self.is_staff = True
+                if update_fields is not None:
+                    kwargs['update_fields'] = {*update_fields, 'is_staff'}
         super().save(*args, **kwargs)
@@ -2,6 +2,7 @@ from django.contrib.auth import authenticate
 from rest_framework import serializers
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from apps.api.serializers import CachedFieldsMixin
 from .models import Usuario
 
 
@@ -52,7 +53,7 @@ class CustomTokenObtainPairSerializer(serializers.Serializer):
         }
 
 
-class UsuarioSerializer(serializers.ModelSerializer):
+class UsuarioSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Serializer para el modelo Usuario.
     Solo lectura, para respuestas de la API.
@@ -87,9 +88,11 @@ class LogoutSerializer(serializers.Serializer):
     refresh = serializers.CharField(required=True)
 
     def validate_refresh(self, value):
-        """Valida que el token sea valido."""
+        """
+        Valida que el token sea valido y lo retorna ya parseado, para no
+        volver a verificarlo al invalidarlo.
+        """
         try:
-            RefreshToken(value)
+            return RefreshToken(value)
         except Exception:
             raise serializers.ValidationError('Token invalido o expirado.')
-        return value
@@ -6,7 +6,6 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.throttling import ScopedRateThrottle
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.views import TokenRefreshView
 
@@ -97,8 +96,8 @@ class LogoutView(GenericAPIView):
         serializer.is_valid(raise_exception=True)
 
         try:
-            token = RefreshToken(serializer.validated_data['refresh'])
-            token.blacklist()
+            # validated_data['refresh'] es el RefreshToken ya verificado
+            serializer.validated_data['refresh'].blacklist()
             logger.info(f"Logout exitoso: {request.user.email}")
             return Response(
                 {'detail': 'Sesion cerrada correctamente.'},
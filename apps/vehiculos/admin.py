@@ -64,6 +64,8 @@ class VehiculoAdmin(admin.ModelAdmin):
         'publicado_en_ml',
         'created_at',
     )
+    # titulo_display (marca y modelo), precio_display (moneda) y estado
+    list_select_related = ('marca', 'modelo', 'moneda', 'estado')
     list_filter = (
         'vendido',
         'reservado',
@@ -207,6 +209,8 @@ class VehiculoAdmin(admin.ModelAdmin):
 @admin.register(ImagenVehiculo)
 class ImagenVehiculoAdmin(admin.ModelAdmin):
     list_display = ('vehiculo', 'orden', 'es_principal', 'created_at')
+    # Vehiculo.__str__ lee marca y modelo
+    list_select_related = ('vehiculo__marca', 'vehiculo__modelo')
     list_filter = ('es_principal', 'created_at')
     search_fields = ('vehiculo__patente',)
     readonly_fields = ('created_at',)
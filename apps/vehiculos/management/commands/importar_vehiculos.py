@@ -15,11 +15,12 @@ Nota: El vendedor debe existir previamente (crear manualmente o importar antes).
 
 import csv
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from decimal import Decimal, InvalidOperation
 
 from django.core.management.base import BaseCommand, CommandError
 from django.core.files import File
-from django.db import transaction
+from django.db import connection, transaction
 from django.utils import timezone
 
 from apps.vehiculos.models import Vehiculo, ImagenVehiculo
@@ -29,10 +30,31 @@ from apps.parametros.models import (
 )
 from apps.usuarios.models import Usuario
 
+# Valores del CSV que se leen como verdadero
+_VALORES_TRUE = frozenset(('true', '1', 'yes', 'si', 's', 'x'))
+
+# Buffer de lectura del CSV (el default es 8KB)
+_CSV_BUFFER = 1 << 20
+
 
 class Command(BaseCommand):
     help = 'Importa vehiculos e imagenes desde el sistema anterior'
 
+    # Filas que se guardan por INSERT ... ON CONFLICT
+    BATCH_SIZE = 500
+    # Threads que comprimen y suben imagenes en paralelo
+    IMAGENES_WORKERS = 4
+
+    # Campos que se pisan cuando la patente ya existe (los de defaults de
+    # _procesar_vehiculo)
+    CAMPOS_ACTUALIZABLES = [
+        'marca', 'modelo', 'combustible', 'caja', 'estado', 'condicion',
+        'moneda', 'vendedor_dueno', 'cargado_por', 'anio', 'km', 'precio',
+        'color', 'version', 'cant_duenos', 'vtv', 'plan_ahorro',
+        'mostrar_en_web', 'comentario_carga', 'segmento1', 'segmento2',
+        'updated_at',
+    ]
+
     def add_arguments(self, parser):
         parser.add_argument(
             '--csv',
@@ -82,11 +104,16 @@ class Command(BaseCommand):
         usuario = self._get_usuario(usuario_email)
         self.stdout.write(f'Usuario para carga: {usuario.email}')
 
+        # Parametros y vendedores en memoria: una consulta por tabla en lugar
+        # de varias por fila
+        self._cargar_lookups()
+
         # Contadores
         self.stats = {
             'total': 0,
             'creados': 0,
             'actualizados': 0,
+            'reemplazadas': 0,
             'imagenes': 0,
             'errores': [],
         }
@@ -102,8 +129,12 @@ class Command(BaseCommand):
         self.stdout.write('')
 
         # Procesar CSV
+        # Vehiculos pendientes de guardar (fila, vehiculo) por patente: si una
+        # patente se repite en el lote queda la ultima fila, como con
+        # update_or_create
+        pendientes = {}
         try:
-            with open(csv_path, 'r', encoding='utf-8-sig') as f:
+            with open(csv_path, 'r', encoding='utf-8-sig', buffering=_CSV_BUFFER) as f:
                 reader = csv.DictReader(f)
 
                 for row_num, row in enumerate(reader, start=2):
@@ -115,24 +146,15 @@ class Command(BaseCommand):
                             self.stats['creados'] += 1
                             self.stdout.write(f'  [OK] Fila {row_num}: {row.get("patente", "?")}')
                         else:
-                            with transaction.atomic():
-                                vehiculo, created = self._procesar_vehiculo(row, usuario)
-
-                                if created:
-                                    self.stats['creados'] += 1
-                                    self.stdout.write(
-                                        self.style.SUCCESS(f'  [CREADO] {vehiculo.patente}')
-                                    )
-                                else:
-                                    self.stats['actualizados'] += 1
-                                    self.stdout.write(f'  [ACTUALIZADO] {vehiculo.patente}')
-
-                                # Importar imagenes
-                                if imagenes_path:
-                                    imgs = self._importar_imagenes(vehiculo, imagenes_path)
-                                    if imgs > 0:
-                                        self.stats['imagenes'] += imgs
-                                        self.stdout.write(f'    -> {imgs} imagenes importadas')
+                            vehiculo = self._procesar_vehiculo(row, usuario)
+                            anterior = pendientes.get(vehiculo.patente)
+                            if anterior is not None:
+                                self.stats['reemplazadas'] += 1
+                                self.stdout.write(self.style.WARNING(
+                                    f'  [REEMPLAZADA] Fila {anterior[0]} ({vehiculo.patente}): '
+                                    f'la reemplaza la fila {row_num}'
+                                ))
+                            pendientes[vehiculo.patente] = (row_num, vehiculo)
 
                     except Exception as e:
                         error_msg = f'Fila {row_num} ({row.get("patente", "?")}): {str(e)}'
@@ -140,11 +162,19 @@ class Command(BaseCommand):
                         self.stdout.write(self.style.ERROR(f'  [ERROR] {error_msg}'))
 
                         if not skip_errors:
+                            # Las filas anteriores se guardan, como antes
+                            self._guardar_lote(pendientes, imagenes_path, skip_errors)
                             raise CommandError(f'Error en fila {row_num}. Use --skip-errors para continuar.')
 
+                    if len(pendientes) >= self.BATCH_SIZE:
+                        self._guardar_lote(pendientes, imagenes_path, skip_errors)
+                        pendientes = {}
+
         except UnicodeDecodeError:
             raise CommandError('Error de codificacion. Asegurate que el CSV este en UTF-8.')
 
+        self._guardar_lote(pendientes, imagenes_path, skip_errors)
+
         # Resumen
         self._mostrar_resumen()
 
@@ -166,6 +196,27 @@ class Command(BaseCommand):
 
         return usuario
 
+    def _cargar_lookups(self):
+        """Indexa por nombre los parametros y por DNI los vendedores."""
+        self.parametros = {}
+        for modelo_class in (Marca, Combustible, Caja, Estado, Condicion, Moneda, Segmento):
+            por_nombre = {}
+            # En el orden por defecto, para que ante nombres repetidos gane el
+            # mismo que devolvia .first()
+            for obj in modelo_class.objects.all():
+                por_nombre.setdefault(obj.nombre.casefold(), obj)
+            self.parametros[modelo_class] = por_nombre
+
+        # Modelos por (marca, nombre) y, para el fallback sin marca, por nombre
+        self.modelos = {}
+        self.modelos_por_nombre = {}
+        for modelo in Modelo.objects.all():
+            nombre = modelo.nombre.casefold()
+            self.modelos[(modelo.marca_id, nombre)] = modelo
+            self.modelos_por_nombre.setdefault(nombre, []).append(modelo)
+
+        self.vendedores = Vendedor.objects.in_bulk(field_name='dni')
+
     def _validar_row(self, row):
         """Valida que una fila tenga los datos requeridos (para dry-run)."""
         campos_requeridos = [
@@ -180,19 +231,19 @@ class Command(BaseCommand):
 
         # Validar que existan los parametros
         marca_nombre = row['marca'].strip()
-        if not Marca.objects.filter(nombre__iexact=marca_nombre).exists():
+        if marca_nombre.casefold() not in self.parametros[Marca]:
             raise ValueError(f'Marca no encontrada: {marca_nombre}')
 
         modelo_nombre = row['modelo'].strip()
-        if not Modelo.objects.filter(nombre__iexact=modelo_nombre).exists():
+        if modelo_nombre.casefold() not in self.modelos_por_nombre:
             raise ValueError(f'Modelo no encontrado: {modelo_nombre}')
 
         vendedor_dni = row['vendedor_dni'].strip()
-        if not Vendedor.objects.filter(dni=vendedor_dni).exists():
+        if vendedor_dni not in self.vendedores:
             raise ValueError(f'Vendedor no encontrado (DNI: {vendedor_dni})')
 
     def _procesar_vehiculo(self, row, usuario):
-        """Procesa una fila del CSV y crea/actualiza el vehiculo."""
+        """Arma el vehiculo de una fila del CSV, sin guardarlo."""
 
         patente = row['patente'].strip().upper()
 
@@ -207,9 +258,8 @@ class Command(BaseCommand):
 
         # Buscar vendedor por DNI
         vendedor_dni = row['vendedor_dni'].strip()
-        try:
-            vendedor = Vendedor.objects.get(dni=vendedor_dni)
-        except Vendedor.DoesNotExist:
+        vendedor = self.vendedores.get(vendedor_dni)
+        if vendedor is None:
             raise ValueError(f'Vendedor no encontrado con DNI: {vendedor_dni}')
 
         # Parsear campos numericos
@@ -245,54 +295,132 @@ class Command(BaseCommand):
             'comentario_carga': row.get('comentarios', '').strip(),
         }
 
-        # Segmentos opcionales
-        if row.get('segmento1'):
-            try:
-                defaults['segmento1'] = Segmento.objects.get(
-                    nombre__iexact=row['segmento1'].strip()
-                )
-            except Segmento.DoesNotExist:
-                pass  # Ignorar si no existe
-
-        if row.get('segmento2'):
-            try:
-                defaults['segmento2'] = Segmento.objects.get(
-                    nombre__iexact=row['segmento2'].strip()
-                )
-            except Segmento.DoesNotExist:
-                pass
+        # Segmentos opcionales (se ignoran si no existen)
+        segmentos = self.parametros[Segmento]
+        for campo in ('segmento1', 'segmento2'):
+            if row.get(campo):
+                segmento = segmentos.get(row[campo].strip().casefold())
+                if segmento is not None:
+                    defaults[campo] = segmento
+
+        return Vehiculo(patente=patente, **defaults)
+
+    def _guardar_lote(self, pendientes, imagenes_path, skip_errors):
+        """
+        Crea o actualiza (por patente) los vehiculos del lote en una sola
+        transaccion y despues importa sus imagenes. Si la base rechaza el
+        lote, se reintenta fila por fila para reportar solo las filas malas.
+        """
+        if not pendientes:
+            return
+        vehiculos = [vehiculo for _, vehiculo in pendientes.values()]
+
+        existentes = {
+            patente: segmentos
+            for patente, *segmentos in Vehiculo.objects.filter(
+                patente__in=pendientes
+            ).values_list('patente', 'segmento1_id', 'segmento2_id')
+        }
+        # Sin segmento en el CSV se conserva el actual, como cuando
+        # update_or_create no lo incluia en defaults
+        for vehiculo in vehiculos:
+            segmentos = existentes.get(vehiculo.patente)
+            if segmentos is not None:
+                if vehiculo.segmento1_id is None:
+                    vehiculo.segmento1_id = segmentos[0]
+                if vehiculo.segmento2_id is None:
+                    vehiculo.segmento2_id = segmentos[1]
 
-        # Crear o actualizar
-        vehiculo, created = Vehiculo.objects.update_or_create(
-            patente=patente,
-            defaults=defaults
+        try:
+            with transaction.atomic():
+                self._upsert_vehiculos(vehiculos)
+            guardados = vehiculos
+        except Exception:
+            guardados = []
+            for row_num, vehiculo in pendientes.values():
+                try:
+                    with transaction.atomic():
+                        self._upsert_vehiculos([vehiculo])
+                except Exception as e:
+                    error_msg = f'Fila {row_num} ({vehiculo.patente}): {str(e)}'
+                    self.stats['errores'].append(error_msg)
+                    self.stdout.write(self.style.ERROR(f'  [ERROR] {error_msg}'))
+                    if not skip_errors:
+                        raise CommandError(f'Error en fila {row_num}. Use --skip-errors para continuar.')
+                    continue
+                guardados.append(vehiculo)
+
+        for vehiculo in guardados:
+            if vehiculo.patente in existentes:
+                self.stats['actualizados'] += 1
+                self.stdout.write(f'  [ACTUALIZADO] {vehiculo.patente}')
+            else:
+                self.stats['creados'] += 1
+                self.stdout.write(self.style.SUCCESS(f'  [CREADO] {vehiculo.patente}'))
+
+        if imagenes_path and guardados:
+            self._importar_imagenes_lote(guardados, imagenes_path)
+
+    def _upsert_vehiculos(self, vehiculos):
+        """INSERT ... ON CONFLICT (patente) DO UPDATE de los vehiculos."""
+        # En Postgres bulk_create asigna el pk tambien a los existentes
+        Vehiculo.objects.bulk_create(
+            vehiculos,
+            update_conflicts=True,
+            unique_fields=['patente'],
+            update_fields=self.CAMPOS_ACTUALIZABLES,
         )
 
-        return vehiculo, created
+    def _importar_imagenes_lote(self, vehiculos, imagenes_path):
+        """Importa las imagenes de varios vehiculos en paralelo."""
+        # Comprimir y subir cada imagen es mayormente espera de I/O
+        with ThreadPoolExecutor(max_workers=self.IMAGENES_WORKERS) as executor:
+            futuros = {
+                executor.submit(self._importar_imagenes_thread, vehiculo, imagenes_path): vehiculo
+                for vehiculo in vehiculos
+            }
+            for futuro in as_completed(futuros):
+                vehiculo = futuros[futuro]
+                try:
+                    imgs = futuro.result()
+                except Exception as e:
+                    self.stdout.write(
+                        self.style.WARNING(f'    ! Error importando imagenes de {vehiculo.patente}: {e}')
+                    )
+                    continue
+                if imgs > 0:
+                    self.stats['imagenes'] += imgs
+                    self.stdout.write(f'    -> {vehiculo.patente}: {imgs} imagenes importadas')
+
+    def _importar_imagenes_thread(self, vehiculo, imagenes_path):
+        try:
+            return self._importar_imagenes(vehiculo, imagenes_path)
+        finally:
+            # Cada thread del pool abre su propia conexion
+            connection.close()
 
     def _buscar_parametro(self, modelo_class, nombre, tipo):
         """Busca un parametro por nombre (case insensitive)."""
         nombre = nombre.strip()
-        try:
-            return modelo_class.objects.get(nombre__iexact=nombre)
-        except modelo_class.DoesNotExist:
+        parametro = self.parametros[modelo_class].get(nombre.casefold())
+        if parametro is None:
             raise ValueError(f'{tipo} no encontrado: {nombre}')
-        except modelo_class.MultipleObjectsReturned:
-            return modelo_class.objects.filter(nombre__iexact=nombre).first()
+        return parametro
 
     def _buscar_modelo(self, nombre, marca):
         """Busca un modelo de vehiculo."""
         nombre = nombre.strip()
-        try:
-            return Modelo.objects.get(nombre__iexact=nombre, marca=marca)
-        except Modelo.DoesNotExist:
-            # Intentar sin filtrar por marca
-            try:
-                return Modelo.objects.get(nombre__iexact=nombre)
-            except Modelo.DoesNotExist:
-                raise ValueError(f'Modelo no encontrado: {nombre} (marca: {marca.nombre})')
-            except Modelo.MultipleObjectsReturned:
-                raise ValueError(f'Multiples modelos encontrados: {nombre}. Especifica la marca correcta.')
+        modelo = self.modelos.get((marca.id, nombre.casefold()))
+        if modelo is not None:
+            return modelo
+
+        # Intentar sin filtrar por marca
+        candidatos = self.modelos_por_nombre.get(nombre.casefold(), [])
+        if not candidatos:
+            raise ValueError(f'Modelo no encontrado: {nombre} (marca: {marca.nombre})')
+        if len(candidatos) > 1:
+            raise ValueError(f'Multiples modelos encontrados: {nombre}. Especifica la marca correcta.')
+        return candidatos[0]
 
     def _parse_bool(self, value):
         """Parsea un valor booleano desde string."""
@@ -300,7 +428,7 @@ class Command(BaseCommand):
             return value
         if not value:
             return False
-        return str(value).lower().strip() in ('true', '1', 'yes', 'si', 's', 'x')
+        return str(value).lower().strip() in _VALORES_TRUE
 
     def _importar_imagenes(self, vehiculo, imagenes_base_path):
         """Importa imagenes para un vehiculo desde una carpeta."""
@@ -363,6 +491,10 @@ class Command(BaseCommand):
             self.style.SUCCESS(f'Vehiculos creados: {self.stats["creados"]}')
         )
         self.stdout.write(f'Vehiculos actualizados: {self.stats["actualizados"]}')
+        if self.stats['reemplazadas']:
+            self.stdout.write(
+                self.style.WARNING(f'Filas reemplazadas por patente repetida: {self.stats["reemplazadas"]}')
+            )
         self.stdout.write(f'Imagenes importadas: {self.stats["imagenes"]}')
 
         if self.stats['errores']:
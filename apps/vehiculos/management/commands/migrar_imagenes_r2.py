@@ -9,7 +9,11 @@ Uso:
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
+
 from django.core.management.base import BaseCommand
+from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
 from django.conf import settings
 from apps.vehiculos.models import ImagenVehiculo
@@ -19,6 +23,9 @@ from apps.publicaciones.models import ImagenPublicacion
 class Command(BaseCommand):
     help = 'Migra imágenes locales a Cloudflare R2'
 
+    # Imágenes que se leen, suben y actualizan por lote
+    BATCH_SIZE = 500
+
     def add_arguments(self, parser):
         parser.add_argument(
             '--dry-run',
@@ -35,11 +42,18 @@ class Command(BaseCommand):
             action='store_true',
             help='Solo migrar imágenes de publicaciones',
         )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=16,
+            help='Subidas simultáneas a R2 (default: 16)',
+        )
 
     def handle(self, *args, **options):
         dry_run = options['dry_run']
         only_vehiculos = options['only_vehiculos']
         only_publicaciones = options['only_publicaciones']
+        workers = options['workers']
 
         # Verificar que R2 está configurado
         if not getattr(settings, 'USE_R2_STORAGE', False):
@@ -56,13 +70,13 @@ class Command(BaseCommand):
 
         # Migrar imágenes de vehículos
         if not only_publicaciones:
-            migradas, errores = self._migrar_imagenes_vehiculos(dry_run)
+            migradas, errores = self._migrar_imagenes_vehiculos(dry_run, workers)
             total_migradas += migradas
             total_errores += errores
 
         # Migrar imágenes de publicaciones
         if not only_vehiculos:
-            migradas, errores = self._migrar_imagenes_publicaciones(dry_run)
+            migradas, errores = self._migrar_imagenes_publicaciones(dry_run, workers)
             total_migradas += migradas
             total_errores += errores
 
@@ -75,53 +89,61 @@ class Command(BaseCommand):
         if dry_run:
             self.stdout.write(self.style.WARNING('\nEsto fue un dry-run. Ejecutá sin --dry-run para aplicar cambios.'))
 
-    def _migrar_imagenes_vehiculos(self, dry_run):
+    def _migrar_imagenes_vehiculos(self, dry_run, workers):
         """Migra imágenes de ImagenVehiculo a R2."""
         self.stdout.write('\n--- Migrando imágenes de VEHÍCULOS ---')
+        return self._migrar_imagenes(ImagenVehiculo, dry_run, workers)
 
-        imagenes = ImagenVehiculo.objects.all()
-        total = imagenes.count()
-        migradas = 0
-        errores = 0
-
-        self.stdout.write(f'Total de imágenes a procesar: {total}')
-
-        for i, img in enumerate(imagenes, 1):
-            try:
-                resultado = self._migrar_imagen(img, 'imagen', dry_run)
-                if resultado:
-                    migradas += 1
-                    self.stdout.write(f'  [{i}/{total}] OK: {img.imagen.name}')
-                else:
-                    self.stdout.write(f'  [{i}/{total}] SKIP: {img.imagen.name} (ya está en R2 o no existe)')
-            except Exception as e:
-                errores += 1
-                self.stdout.write(self.style.ERROR(f'  [{i}/{total}] ERROR: {img.imagen.name} - {str(e)}'))
-
-        return migradas, errores
-
-    def _migrar_imagenes_publicaciones(self, dry_run):
+    def _migrar_imagenes_publicaciones(self, dry_run, workers):
         """Migra imágenes de ImagenPublicacion a R2."""
         self.stdout.write('\n--- Migrando imágenes de PUBLICACIONES ---')
+        return self._migrar_imagenes(ImagenPublicacion, dry_run, workers)
 
-        imagenes = ImagenPublicacion.objects.all()
+    def _migrar_imagenes(self, modelo_class, dry_run, workers):
+        """
+        Sube las imágenes de a lotes, varias a la vez (cada subida es
+        mayormente espera de red), y guarda los nombres nuevos del lote con
+        un solo bulk_update.
+        """
+        imagenes = modelo_class.objects.all()
         total = imagenes.count()
         migradas = 0
         errores = 0
+        i = 0
 
         self.stdout.write(f'Total de imágenes a procesar: {total}')
 
-        for i, img in enumerate(imagenes, 1):
-            try:
-                resultado = self._migrar_imagen(img, 'imagen', dry_run)
-                if resultado:
-                    migradas += 1
-                    self.stdout.write(f'  [{i}/{total}] OK: {img.imagen.name}')
-                else:
-                    self.stdout.write(f'  [{i}/{total}] SKIP: {img.imagen.name} (ya está en R2 o no existe)')
-            except Exception as e:
-                errores += 1
-                self.stdout.write(self.style.ERROR(f'  [{i}/{total}] ERROR: {img.imagen.name} - {str(e)}'))
+        filas = imagenes.iterator(chunk_size=self.BATCH_SIZE)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while True:
+                lote = list(islice(filas, self.BATCH_SIZE))
+                if not lote:
+                    break
+
+                futuros = {
+                    executor.submit(self._migrar_imagen, img, 'imagen', dry_run): img
+                    for img in lote
+                }
+                actualizadas = []
+                for futuro in as_completed(futuros):
+                    img = futuros[futuro]
+                    i += 1
+                    try:
+                        resultado = futuro.result()
+                        if resultado:
+                            migradas += 1
+                            if not dry_run:
+                                actualizadas.append(img)
+                            self.stdout.write(f'  [{i}/{total}] OK: {img.imagen.name}')
+                        else:
+                            self.stdout.write(f'  [{i}/{total}] SKIP: {img.imagen.name} (ya está en R2 o no existe)')
+                    except Exception as e:
+                        errores += 1
+                        self.stdout.write(self.style.ERROR(f'  [{i}/{total}] ERROR: {img.imagen.name} - {str(e)}'))
+
+                # bulk_update no pasa por save(), que comprimiría de nuevo
+                if actualizadas:
+                    modelo_class.objects.bulk_update(actualizadas, ['imagen'])
 
         return migradas, errores
 
@@ -129,7 +151,7 @@ class Command(BaseCommand):
         """
         Migra una imagen individual de almacenamiento local a R2.
 
-        Retorna True si se migró, False si se saltó.
+        Retorna True si se migró, False si se saltó. No guarda la instancia.
         """
         field = getattr(instance, field_name)
 
@@ -153,12 +175,10 @@ class Command(BaseCommand):
 
         # Guardar en R2 (el default_storage ahora es S3)
         # Usamos el mismo nombre/ruta para mantener consistencia
-        saved_name = default_storage.save(field.name,
-            __import__('django.core.files.base', fromlist=['ContentFile']).ContentFile(file_content)
-        )
+        saved_name = default_storage.save(field.name, ContentFile(file_content))
 
-        # Actualizar el campo en el modelo (sin disparar la compresión)
-        # Usamos update() para evitar el save() que comprimiría de nuevo
-        instance.__class__.objects.filter(pk=instance.pk).update(**{field_name: saved_name})
+        # El nombre se persiste con el bulk_update del lote (corre en un
+        # thread del pool: sin consultas a la base acá)
+        field.name = saved_name
 
         return True
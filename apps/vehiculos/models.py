@@ -5,7 +5,6 @@ from django.core.files.uploadedfile import InMemoryUploadedFile
 from decimal import Decimal
 from PIL import Image
 from io import BytesIO
-import sys
 import os
 
 
@@ -384,13 +383,17 @@ class ImagenVehiculo(models.Model):
         """Comprime y redimensiona la imagen a JPEG 80% calidad, max 1920x1080."""
         try:
             img = Image.open(self.imagen)
+            max_size = (1920, 1080)
+
+            # JPEG: decodificar ya reducido (escalado DCT de libjpeg)
+            if img.format == 'JPEG':
+                img.draft('RGB', max_size)
 
             # Convertir a RGB si es necesario (RGBA, P -> RGB para JPEG)
             if img.mode in ('RGBA', 'P'):
                 img = img.convert('RGB')
 
             # Redimensionar si es muy grande (mantiene aspect ratio)
-            max_size = (1920, 1080)
             img.thumbnail(max_size, Image.Resampling.LANCZOS)
 
             # Comprimir a JPEG 80%
@@ -408,7 +411,7 @@ class ImagenVehiculo(models.Model):
                 'ImageField',
                 new_name,
                 'image/jpeg',
-                sys.getsizeof(output),
+                output.getbuffer().nbytes,
                 None
             )
         except Exception:
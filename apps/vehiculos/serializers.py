@@ -87,9 +87,13 @@ class VehiculoListSerializer(serializers.ModelSerializer):
         ]
 
     def get_imagen_principal(self, obj):
-        imagen = obj.imagenes.filter(es_principal=True).first()
-        if not imagen:
-            imagen = obj.imagenes.first()
+        # Se elige sobre las imagenes precargadas por la vista: filter() y
+        # first() consultarian la base una o dos veces por vehiculo
+        imagenes = obj.imagenes.all()
+        imagen = next(
+            (img for img in imagenes if img.es_principal),
+            imagenes[0] if imagenes else None
+        )
         if imagen:
             request = self.context.get('request')
             if request:
@@ -184,6 +184,35 @@ if USE_R2_STORAGE:
         MEDIA_URL = f'https://{AWS_S3_CUSTOM_DOMAIN}/'
 
 
+# Formato de compresion de imagenes de publicaciones: WEBP (default) o JPEG
+PUBLICACIONES_IMAGEN_FORMATO = os.getenv('PUBLICACIONES_IMAGEN_FORMATO', 'WEBP').upper()
+
+
+# default queda en memoria del proceso (throttling de DRF); las estadisticas
+# van en una cache compartida entre workers de gunicorn (tabla creada por
+# createcachetable)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'estadisticas': {
+        'BACKEND': os.getenv(
+            'ESTADISTICAS_CACHE_BACKEND', 'django.core.cache.backends.db.DatabaseCache'
+        ),
+        'LOCATION': os.getenv('ESTADISTICAS_CACHE_LOCATION', 'django_cache'),
+    },
+}
+
+# Renderiza las respuestas de reservas con orjson (False: JSONRenderer de DRF)
+RESERVAS_ORJSON = os.getenv('RESERVAS_ORJSON', 'True').lower() == 'true'
+
+# Segundos que se cachean las estadisticas de reservas (se invalidan al escribir)
+RESERVAS_ESTADISTICAS_CACHE_TIMEOUT = int(os.getenv('RESERVAS_ESTADISTICAS_CACHE_TIMEOUT', '300'))
+
+# Segundos que se cachean las estadisticas de reuniones (se invalidan al escribir)
+REUNIONES_ESTADISTICAS_CACHE_TIMEOUT = int(os.getenv('REUNIONES_ESTADISTICAS_CACHE_TIMEOUT', '60'))
+
+
 # Default primary key field type
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -352,6 +381,11 @@ LOGGING = {
             'level': 'INFO',
             'propagate': False,
         },
+        'apps.publicaciones': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
 
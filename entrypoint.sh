@@ -12,6 +12,9 @@ echo "PostgreSQL disponible!"
 
 echo "Aplicando migraciones..."
 python manage.py migrate --noinput
+# Tabla de CACHES['estadisticas'] (DatabaseCache); no hace nada si esa
+# cache usa otro backend
+python manage.py createcachetable
 
 echo "Recopilando archivos estaticos..."
 python manage.py collectstatic --noinput